@@ -38,19 +38,32 @@ from src.ui import HUD
 class AirForge:
     """Main application class."""
     
-    def __init__(self, grid_size: int = 16, window_size: tuple = (1280, 720)):
+    def __init__(self, grid_size: int = 16, window_size: tuple = (1280, 720),
+                 model_path: str = None, min_detection_confidence: float = 0.5,
+                 min_tracking_confidence: float = 0.5, infer_every: int = 2):
         """Initialize AirForge.
         
         Args:
             grid_size: Voxel grid size
             window_size: Window dimensions (width, height)
+            model_path: Hand landmarker model (e.g. a lite .task bundle)
+            min_detection_confidence: Palm detector confidence threshold
+            min_tracking_confidence: Landmark tracking confidence threshold
+            infer_every: Run hand tracking inference on every Nth camera frame
         """
         print("\n[START] Starting AirForge - Gesture-Controlled 3D Voxel Editor\n")
         
         # Initialize components
-        self.hand_tracker = HandTracker()
+        self.hand_tracker = HandTracker(
+            model_path=model_path,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            infer_every=infer_every
+        )
         self.gesture_detector = GestureDetector()
+        self.gesture_detector.warmup()
         self.voxel_engine = VoxelEngine(grid_size=grid_size)
+        self.voxel_engine.warmup()
         self.camera = Camera(target=(grid_size/2, grid_size/2, grid_size/2))
         self.renderer = Renderer(width=window_size[0], height=window_size[1])
         self.hud = HUD(window_size[0], window_size[1])
@@ -62,6 +75,15 @@ class AirForge:
         self.cursor_pos = (grid_size // 2, grid_size // 2, grid_size // 2)
         self.last_hand_pos = None
         
+        # Hand -> grid mapping, applied as hand * scale + bias:
+        # Hand x (0-1) -> Grid x (0 to grid_size)
+        # Hand y (0-1) -> Grid y (grid_size to 0) - inverted
+        # Hand z (depth) -> Grid z, scaled and offset around the center
+        #   (MediaPipe z is negative when hand is closer)
+        self._cursor_scale = np.array([grid_size, -grid_size, -50.0], dtype=np.float32)
+        self._cursor_bias = np.array([0.0, grid_size, grid_size / 2], dtype=np.float32)
+        self._cursor_buf = np.empty(3, dtype=np.float32)
+        
         # Camera rotation state
         self.rotating = False
         self.last_grab_pos = None
@@ -71,6 +93,12 @@ class AirForge:
         self.delete_cooldown = 0
         self.cooldown_frames = 10
         
+        # Context locking (time-based, in pygame ticks)
+        self.action_lock_until = 0
+        self.pinch_fired = False
+        self.delete_fired = False
+        self._peace_active = False
+        
         # Add some starter voxels for demo
         self._create_demo_structure()
         
@@ -87,41 +115,48 @@ class AirForge:
     def run(self):
         """Main application loop."""
         clock = pygame.time.Clock()
+        gesture = Gesture.NONE
+        last_frame = None
         
         try:
             while self.running:
                 # Handle events
                 self._handle_events()
+                current_time = pygame.time.get_ticks()
                 
-                # Process hand tracking
+                # Process hand tracking (non-blocking; repeats the last result
+                # until the camera delivers a new frame)
                 frame, landmarks = self.hand_tracker.process()
                 if frame is None:
                     continue
                 
-                # Detect gesture
-                gesture = self.gesture_detector.detect(landmarks)
-                
-                # Update cursor and actions based on gesture
-                self._process_gesture(gesture, landmarks)
-                
-                # Update camera
-                self.camera.update()
-                
-                # Decay cooldowns
-                if self.place_cooldown > 0:
-                    self.place_cooldown -= 1
-                if self.delete_cooldown > 0:
-                    self.delete_cooldown -= 1
-                
-                # Render
-                # Draw landmarks on frame for "trace" effect
-                if landmarks:
-                    self.hand_tracker.draw_landmarks(frame, landmarks)
-                
-                # Convert BGR to RGB for rendering
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                new_frame = frame is not last_frame
+                if new_frame:
+                    last_frame = frame
+                    
+                    # Detect gesture
+                    gesture = self.gesture_detector.detect(landmarks)
+                    
+                    # Update cursor and actions based on gesture
+                    self._process_gesture(gesture, landmarks, current_time)
+                    
+                    # Draw landmarks on frame for "trace" effect (once per
+                    # camera frame; repeats reuse the uploaded texture)
+                    if landmarks is not None:
+                        self.hand_tracker.draw_landmarks(frame, landmarks)
+                    
+                    # Camera smoothing and cooldowns are per camera frame
+                    # (~30 Hz), not per render tick
+                    self.camera.update()
+                    
+                    # Decay cooldowns
+                    if self.place_cooldown > 0:
+                        self.place_cooldown -= 1
+                    if self.delete_cooldown > 0:
+                        self.delete_cooldown -= 1
                 
-                self._render(gesture, frame_rgb)
+                # Render (frame stays BGR; the renderer uploads it as GL_BGR)
+                self._render(gesture, frame, bg_changed=new_frame)
                 
                 # Cap framerate
                 clock.tick(60)
@@ -151,20 +186,18 @@ class AirForge:
                     self.voxel_engine.next_color()
                 elif event.key == K_r:
                     # Reset camera
-                    self.camera.yaw = 45
-                    self.camera.pitch = 30
-                    self.camera.target_yaw = 45
-                    self.camera.target_pitch = 30
+                    self.camera.reset(yaw=45, pitch=30)
                 elif event.key == K_x:
                     self.voxel_engine.clear()
                     self._create_demo_structure()
     
-    def _process_gesture(self, gesture: Gesture, landmarks):
+    def _process_gesture(self, gesture: Gesture, landmarks, current_time: int):
         """Process detected gesture and update state.
         
         Args:
             gesture: Detected gesture
             landmarks: Hand landmarks
+            current_time: Frame timestamp from pygame.time.get_ticks()
         """
         if landmarks is None:
             self.last_hand_pos = None
@@ -176,31 +209,15 @@ class AirForge:
         if hand_pos is None:
             return
         
-        # Map hand position to 3D cursor
-        # Hand x (0-1) -> Grid x (0 to grid_size)
-        # Hand y (0-1) -> Grid y (grid_size to 0) - inverted
-        # Hand z (depth) -> Grid z (approximate)
-        cursor_x = int(hand_pos[0] * self.grid_size)
-        cursor_y = int((1 - hand_pos[1]) * self.grid_size)  # Invert Y
-        
-        # Use hand depth for Z, scaled and offset
-        # MediaPipe z is negative when hand is closer
-        cursor_z = int(self.grid_size / 2 - hand_pos[2] * 50)
+        # Map hand position to 3D cursor: pos = hand * scale + bias, clamped
+        pos = self._cursor_buf
+        np.multiply(hand_pos, self._cursor_scale, out=pos)
+        pos += self._cursor_bias
+        np.clip(pos, 0, self.grid_size - 1, out=pos)
         
-        # Clamp to grid
-        cursor_x = max(0, min(self.grid_size - 1, cursor_x))
-        cursor_y = max(0, min(self.grid_size - 1, cursor_y))
-        cursor_z = max(0, min(self.grid_size - 1, cursor_z))
-        
-        self.cursor_pos = (cursor_x, cursor_y, cursor_z)
+        self.cursor_pos = tuple(pos.astype(np.int32).tolist())
         
         # Context Locking (Time-based)
-        current_time = pygame.time.get_ticks()
-        if not hasattr(self, 'action_lock_until'):
-            self.action_lock_until = 0
-            self.pinch_fired = False
-            self.delete_fired = False
-        
         # Reset firing flags if gesture changes
         if gesture != Gesture.PINCH:
             self.pinch_fired = False
@@ -244,7 +261,7 @@ class AirForge:
         
         if gesture == Gesture.PEACE:
             # Color picker - cycle on gesture start (already one-shot via flag)
-            if not hasattr(self, '_peace_active') or not self._peace_active:
+            if not self._peace_active:
                 self.voxel_engine.next_color()
                 self._peace_active = True
                 self.action_lock_until = current_time + 300 # Lock after color switch
@@ -253,18 +270,21 @@ class AirForge:
         
         self.last_hand_pos = hand_pos
     
-    def _render(self, gesture: Gesture, bg_frame=None):
+    def _render(self, gesture: Gesture, bg_frame=None, bg_changed: bool = True):
         """Render the scene.
         
         Args:
             gesture: Current gesture for HUD display
-            bg_frame: Optional RGB background frame
+            bg_frame: Optional BGR background frame
+            bg_changed: False if bg_frame was already uploaded last frame
         """
         # Clear/Draw Background
-        if bg_frame is not None:
+        if bg_frame is None:
+            self.renderer.clear()
+        elif bg_changed:
             self.renderer.render_background(bg_frame)
         else:
-            self.renderer.clear()
+            self.renderer.render_background_cached()
         
         # Set camera
         self.renderer.set_camera(self.camera)
@@ -287,7 +307,7 @@ class AirForge:
             gesture=gesture,
             cursor_pos=self.cursor_pos,
             current_color=self.voxel_engine.current_color,
-            voxel_count=len(self.voxel_engine.voxels)
+            voxel_count=self.voxel_engine.voxel_count
         )
         
         # Swap buffers
@@ -1,4 +1,6 @@
 """3D camera for orbiting around the voxel scene."""
+import functools
+import math
 import numpy as np
 from typing import Tuple
 
@@ -27,6 +29,24 @@ class Camera:
         self.max_pitch = 80.0
         self.min_distance = 10.0
         self.max_distance = 100.0
+        
+        # Cached view matrix, rebuilt only when the camera moves
+        self._view_mat = np.identity(4, dtype=np.float32)
+        self._pos_buf = np.empty(3, dtype=np.float32)
+        self._dirty = True
+        self.view_revision = 0  # Bumped whenever the cached view matrix changes
+        self.settle_epsilon = 1e-4
+    
+    def reset(self, yaw: float = 45.0, pitch: float = 30.0):
+        """Snap camera to a fixed orientation.
+        
+        Args:
+            yaw: Horizontal rotation (degrees)
+            pitch: Vertical rotation (degrees)
+        """
+        self.yaw = self.target_yaw = yaw
+        self.pitch = self.target_pitch = pitch
+        self._dirty = True
     
     def orbit(self, delta_yaw: float, delta_pitch: float):
         """Rotate camera around target.
@@ -49,66 +69,100 @@ class Camera:
         """
         self.distance -= delta
         self.distance = max(self.min_distance, min(self.max_distance, self.distance))
+        self._dirty = True
     
     def update(self):
         """Smooth camera movement - call each frame."""
-        self.yaw += (self.target_yaw - self.yaw) * self.smoothing
-        self.pitch += (self.target_pitch - self.pitch) * self.smoothing
+        d_yaw = self.target_yaw - self.yaw
+        d_pitch = self.target_pitch - self.pitch
+        
+        # Settled: snap onto the target once, then leave the cached view alone
+        if abs(d_yaw) < self.settle_epsilon and abs(d_pitch) < self.settle_epsilon:
+            if d_yaw != 0.0 or d_pitch != 0.0:
+                self.yaw = self.target_yaw
+                self.pitch = self.target_pitch
+                self._dirty = True
+            return
+        
+        self.yaw += d_yaw * self.smoothing
+        self.pitch += d_pitch * self.smoothing
+        self._dirty = True
     
     def get_position(self) -> np.ndarray:
         """Get camera position in world space.
         
+        Written into a preallocated buffer; treat the result as read-only.
+        
         Returns:
             np.ndarray: (x, y, z) camera position
         """
         # Convert spherical to cartesian coordinates
-        yaw_rad = np.radians(self.yaw)
-        pitch_rad = np.radians(self.pitch)
+        yaw_rad = math.radians(self.yaw)
+        pitch_rad = math.radians(self.pitch)
+        cos_pitch = math.cos(pitch_rad)
         
-        x = self.distance * np.cos(pitch_rad) * np.sin(yaw_rad)
-        y = self.distance * np.sin(pitch_rad)
-        z = self.distance * np.cos(pitch_rad) * np.cos(yaw_rad)
+        pos = self._pos_buf
+        pos[0] = self.target[0] + self.distance * cos_pitch * math.sin(yaw_rad)
+        pos[1] = self.target[1] + self.distance * math.sin(pitch_rad)
+        pos[2] = self.target[2] + self.distance * cos_pitch * math.cos(yaw_rad)
         
-        return self.target + np.array([x, y, z])
+        return pos
     
     def get_view_matrix(self) -> np.ndarray:
         """Get 4x4 view matrix for OpenGL.
         
+        The matrix is cached and only rebuilt after the camera moves, so
+        treat the returned array as read-only.
+        
         Returns:
             np.ndarray: 4x4 view matrix
         """
-        eye = self.get_position()
-        center = self.target
-        up = np.array([0.0, 1.0, 0.0])
+        if self._dirty:
+            self._look_at(self.get_position(), self.target)
+            self._dirty = False
+            self.view_revision += 1
         
-        return self._look_at(eye, center, up)
+        return self._view_mat
     
-    def _look_at(self, eye: np.ndarray, center: np.ndarray, up: np.ndarray) -> np.ndarray:
-        """Create look-at view matrix.
+    def _look_at(self, eye: np.ndarray, center: np.ndarray) -> np.ndarray:
+        """Create Y-up look-at view matrix (written into the cached matrix).
+        
+        Plain float math: NumPy dispatch costs far more than the FLOPs on
+        3-vectors.
         
         Args:
             eye: Camera position
             center: Look-at target
-            up: Up vector
             
         Returns:
             np.ndarray: 4x4 view matrix
         """
-        f = center - eye
-        f = f / np.linalg.norm(f)  # Forward
-        
-        s = np.cross(f, up)
-        s = s / np.linalg.norm(s)  # Side
-        
-        u = np.cross(s, f)  # Up
-        
-        result = np.identity(4, dtype=np.float32)
-        result[0, 0:3] = s
-        result[1, 0:3] = u
-        result[2, 0:3] = -f
-        result[0, 3] = -np.dot(s, eye)
-        result[1, 3] = -np.dot(u, eye)
-        result[2, 3] = np.dot(f, eye)
+        ex, ey, ez = float(eye[0]), float(eye[1]), float(eye[2])
+        
+        # Forward
+        fx = float(center[0]) - ex
+        fy = float(center[1]) - ey
+        fz = float(center[2]) - ez
+        inv = 1.0 / math.sqrt(fx*fx + fy*fy + fz*fz)
+        fx *= inv; fy *= inv; fz *= inv
+        
+        # Side = forward x (0, 1, 0)
+        sx, sz = -fz, fx
+        inv = 1.0 / math.sqrt(sx*sx + sz*sz)
+        sx *= inv; sz *= inv
+        
+        # Up = side x forward
+        ux = -sz * fy
+        uy = sz * fx - sx * fz
+        uz = sx * fy
+        
+        result = self._view_mat
+        result[0, 0] = sx; result[0, 1] = 0.0; result[0, 2] = sz
+        result[1, 0] = ux; result[1, 1] = uy; result[1, 2] = uz
+        result[2, 0] = -fx; result[2, 1] = -fy; result[2, 2] = -fz
+        result[0, 3] = -(sx*ex + sz*ez)
+        result[1, 3] = -(ux*ex + uy*ey + uz*ez)
+        result[2, 3] = fx*ex + fy*ey + fz*ez
         
         return result
     
@@ -116,6 +170,9 @@ class Camera:
     def perspective(fov: float, aspect: float, near: float, far: float) -> np.ndarray:
         """Create perspective projection matrix.
         
+        Results are cached per argument set (they only change on window
+        resize), so the returned array is shared and read-only.
+        
         Args:
             fov: Field of view in degrees
             aspect: Aspect ratio (width/height)
@@ -125,14 +182,20 @@ class Camera:
         Returns:
             np.ndarray: 4x4 projection matrix
         """
-        fov_rad = np.radians(fov)
-        f = 1.0 / np.tan(fov_rad / 2.0)
-        
-        result = np.zeros((4, 4), dtype=np.float32)
-        result[0, 0] = f / aspect
-        result[1, 1] = f
-        result[2, 2] = (far + near) / (near - far)
-        result[2, 3] = (2 * far * near) / (near - far)
-        result[3, 2] = -1.0
-        
-        return result
+        return _perspective_cached(float(fov), float(aspect), float(near), float(far))
+
+
+@functools.lru_cache(maxsize=8)
+def _perspective_cached(fov: float, aspect: float, near: float, far: float) -> np.ndarray:
+    """Build a read-only perspective projection matrix (see Camera.perspective)."""
+    f = 1.0 / math.tan(math.radians(fov) / 2.0)
+    
+    result = np.zeros((4, 4), dtype=np.float32)
+    result[0, 0] = f / aspect
+    result[1, 1] = f
+    result[2, 2] = (far + near) / (near - far)
+    result[2, 3] = (2 * far * near) / (near - far)
+    result[3, 2] = -1.0
+    result.flags.writeable = False
+    
+    return result
@@ -1,8 +1,11 @@
 """Gesture detection from hand landmarks."""
+import math
 import numpy as np
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Optional, Dict
 
+from .jit import njit, NUMBA_AVAILABLE
+
 
 class Gesture(Enum):
     """Recognized hand gestures."""
@@ -14,6 +17,19 @@ class Gesture(Enum):
     PEACE = "peace"      # Index + Middle extended
 
 
+class State(IntEnum):
+    """Gesture state machine states."""
+    IDLE = 0
+    HAND_PRESENT = 1
+    PRE_PINCH = 2
+    PINCHED = 3
+    RELEASE = 4
+
+
+# Score tuple positions (POINT is the fallback, so it has no score)
+PINCH_SCORE, PALM_SCORE, GRAB_SCORE, PEACE_SCORE = 0, 1, 2, 3
+SCORE_NAMES = ("pinch", "palm", "grab", "peace")
+
 # Landmark indices
 WRIST = 0
 THUMB_CMC, THUMB_MCP, THUMB_IP, THUMB_TIP = 1, 2, 3, 4
@@ -21,15 +37,94 @@ INDEX_MCP, INDEX_PIP, INDEX_DIP, INDEX_TIP = 5, 6, 7, 8
 MIDDLE_MCP, MIDDLE_PIP, MIDDLE_DIP, MIDDLE_TIP = 9, 10, 11, 12
 RING_MCP, RING_PIP, RING_DIP, RING_TIP = 13, 14, 15, 16
 PINKY_MCP, PINKY_PIP, PINKY_DIP, PINKY_TIP = 17, 18, 19, 20
+NUM_LANDMARKS = 21
+
+
+def landmarks_to_array(landmarks, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Copy landmark .x/.y/.z attributes into a (21, 3) float32 array.
+    
+    Arrays are passed through unchanged, so callers can hand over
+    landmarks that were already converted.
+    
+    Args:
+        landmarks: MediaPipe hand landmarks (or a (21, 3) array)
+        out: Optional preallocated (21, 3) float32 buffer
+        
+    Returns:
+        np.ndarray: (21, 3) landmark coordinates
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, lm in enumerate(landmarks):
+        out[i, 0] = lm.x
+        out[i, 1] = lm.y
+        out[i, 2] = lm.z
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _hand_scale_sq(lm):
+    """Squared max of Wrist->IndexMCP and Wrist->MiddleMCP on a (21, 3) array."""
+    dx = lm[INDEX_MCP, 0] - lm[WRIST, 0]
+    dy = lm[INDEX_MCP, 1] - lm[WRIST, 1]
+    dz = lm[INDEX_MCP, 2] - lm[WRIST, 2]
+    d1_sq = dx*dx + dy*dy + dz*dz
+    dx = lm[MIDDLE_MCP, 0] - lm[WRIST, 0]
+    dy = lm[MIDDLE_MCP, 1] - lm[WRIST, 1]
+    dz = lm[MIDDLE_MCP, 2] - lm[WRIST, 2]
+    d2_sq = dx*dx + dy*dy + dz*dz
+    return max(d1_sq, d2_sq, 0.0001)
+
+
+@njit(cache=True, fastmath=True)
+def _finger_extended(lm, mcp, pip, tip, curl_threshold):
+    tip_y = lm[tip, 1]
+    return tip_y < lm[pip, 1] - curl_threshold and tip_y < lm[mcp, 1]
+
+
+@njit(cache=True, fastmath=True)
+def _score_gestures(lm, scale_sq, curl_threshold):
+    """Compiled equivalent of GestureDetector._get_gesture_scores.
+
+    Returns:
+        tuple: (pinch, palm, grab, peace) scores
+    """
+    dx = lm[THUMB_TIP, 0] - lm[INDEX_TIP, 0]
+    dy = lm[THUMB_TIP, 1] - lm[INDEX_TIP, 1]
+    dz = lm[THUMB_TIP, 2] - lm[INDEX_TIP, 2]
+    norm_pinch = math.sqrt((dx*dx + dy*dy + dz*dz) / scale_sq)
+    pinch = max(0.0, min(1.0, 1.0 - norm_pinch / 0.5))
+
+    index = _finger_extended(lm, INDEX_MCP, INDEX_PIP, INDEX_TIP, curl_threshold)
+    middle = _finger_extended(lm, MIDDLE_MCP, MIDDLE_PIP, MIDDLE_TIP, curl_threshold)
+    ring = _finger_extended(lm, RING_MCP, RING_PIP, RING_TIP, curl_threshold)
+    pinky = _finger_extended(lm, PINKY_MCP, PINKY_PIP, PINKY_TIP, curl_threshold)
+    ext_count = int(index) + int(middle) + int(ring) + int(pinky)
+
+    index_mcp_x = lm[INDEX_MCP, 0]
+    thumb_ext = (abs(lm[THUMB_TIP, 0] - index_mcp_x)
+                 > abs(lm[THUMB_MCP, 0] - index_mcp_x) + 0.05)
+
+    palm = 1.0 if (ext_count == 4 and thumb_ext) else 0.0
+    grab = 1.0 if (ext_count == 0 and not thumb_ext) else 0.0
+    peace = 1.0 if (index and middle and not ring and not pinky) else 0.0
+    return pinch, palm, grab, peace
 
 
 class GestureDetector:
     """Detect hand gestures from MediaPipe landmarks."""
     
-    def __init__(self):
-        """Initialize gesture detector with robust thresholds."""
-        # Visual cues for debug
-        self.last_scores = {}
+    def __init__(self, use_numba: bool = True):
+        """Initialize gesture detector with robust thresholds.
+        
+        Args:
+            use_numba: Score gestures with the compiled kernel (falls back
+                to the pure Python path when Numba is not installed)
+        """
+        # Visual cues for debug: (pinch, palm, grab, peace)
+        self._scores = ()
         
         # Thresholds (using normalized scores 0.0-1.0)
         self.pinch_threshold = 0.8
@@ -39,8 +134,49 @@ class GestureDetector:
         self.min_hold_frames = 3
         
         # State machine variables
-        self.state = "IDLE"
+        self._state = State.IDLE
         self.state_frames = 0
+        self._state_fns = (
+            self._on_idle,
+            self._on_hand_present,
+            self._on_pre_pinch,
+            self._on_pinched,
+            self._on_release,
+        )
+        
+        # Compiled scoring path
+        self.use_numba = use_numba and NUMBA_AVAILABLE
+        self._lm = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._palm_idx = np.array([WRIST, INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP])
+        self._mcp_idx = np.array([INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP])
+        self._pip_idx = np.array([INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP])
+        self._tip_idx = np.array([INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+    
+    def warmup(self):
+        """Compile the Numba kernels ahead of the render loop.
+        
+        Numba compiles lazily on first call; doing it here keeps the first
+        detected hand from stalling a frame. With cache=True the compiled
+        code is reused from disk on later runs.
+        """
+        if not self.use_numba:
+            return
+        dummy = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        _score_gestures(dummy, _hand_scale_sq(dummy), self.curl_threshold)
+    
+    @property
+    def state(self) -> str:
+        """Current state machine state name (e.g. "PINCHED")."""
+        return self._state.name
+    
+    @state.setter
+    def state(self, value):
+        self._state = State[value] if isinstance(value, str) else State(value)
+    
+    @property
+    def last_scores(self) -> Dict[str, float]:
+        """Scores from the last detect() call, keyed by gesture name."""
+        return dict(zip(SCORE_NAMES, self._scores))
     
     def detect(self, landmarks) -> Gesture:
         """Detect gesture from hand landmarks using State Machine.
@@ -52,147 +188,152 @@ class GestureDetector:
             Gesture: Detected gesture
         """
         if landmarks is None:
-            self.state = "IDLE"
+            self._state = State.IDLE
             self.gesture_hold_frames = 0
             self.last_gesture = Gesture.NONE
             return Gesture.NONE
         
-        # 1. Normalize & Score
-        scale = self._get_hand_scale(landmarks)
-        if scale == 0: return Gesture.NONE
-        
-        scores = self._get_gesture_scores(landmarks, scale)
-        self.last_scores = scores
+        # 1. Normalize & Score (one attribute pass, then plain indexing)
+        lm = landmarks_to_array(landmarks, self._lm)
+        if self.use_numba:
+            scale_sq = _hand_scale_sq(lm)
+            scores = _score_gestures(lm, scale_sq, self.curl_threshold)
+        else:
+            scale_sq = self._get_hand_scale_sq(lm)
+            if scale_sq == 0: return Gesture.NONE
+            
+            scores = self._get_gesture_scores(lm, scale_sq)
+        self._scores = scores
         
         # 2. State Machine Transitions
         # States: IDLE -> HAND_PRESENT -> PRE_PINCH -> PINCHED -> RELEASE -> HAND_PRESENT
-        
-        new_gesture = Gesture.NONE
-        pinch_score = scores["pinch"]
-        
-        # State: IDLE (Hand just appeared)
-        if self.state == "IDLE":
-            self.state = "HAND_PRESENT"
-        
-        # State: HAND_PRESENT (Neutral)
-        if self.state == "HAND_PRESENT":
-            if pinch_score > 0.4: # Lowered from 0.5
-                self.state = "PRE_PINCH"
-            elif scores["palm"] > 0.8:
-                new_gesture = Gesture.PALM
-            elif scores["grab"] > 0.8:
-                new_gesture = Gesture.GRAB
-            elif scores["peace"] > 0.8:
-                new_gesture = Gesture.PEACE
-            else:
-                new_gesture = Gesture.POINT # Default to point
-        
-        # State: PRE_PINCH (Approaching pinch)
-        elif self.state == "PRE_PINCH":
-            if pinch_score > 0.7: # Lowered from 0.75
-                # Angle check - Temporarily disabled/relaxed
-                # if self._check_pinch_angle(landmarks): 
-                self.state = "PINCHED"
-            elif pinch_score < 0.3: # Lowered dropout
-                # Aborted pinch
-                self.state = "HAND_PRESENT"
-            
-            # While in pre-pinch, we are technically "POINTING" but careful
-            new_gesture = Gesture.POINT
-            
-        # State: PINCHED (Active action)
-        elif self.state == "PINCHED":
-            if pinch_score < 0.5: # Released (Lowered from 0.6 to match easier entry)
-                self.state = "RELEASE"
-            else:
-                new_gesture = Gesture.PINCH
-        
-        # State: RELEASE (Hysteresis / Cooldown)
-        elif self.state == "RELEASE":
-            if pinch_score < 0.3: # Fully opened
-                self.state = "HAND_PRESENT"
-            elif pinch_score > 0.8: # Re-pinched too fast? 
-                # Require full release first, so ignore re-pinch here
-                pass
-            
-            # Show Point during release
-            new_gesture = Gesture.POINT
+        new_gesture = self._state_fns[self._state](scores)
 
         # 3. Temporal Consistency (Debounce output only)
         # We trust the state machine for transitions, but average the output label
-        if new_gesture == self.last_gesture:
+        if new_gesture is self.last_gesture:
             self.gesture_hold_frames += 1
         else:
             self.gesture_hold_frames = 1
             self.last_gesture = new_gesture
             
         # Fast path for PINCH (responsiveness)
-        if new_gesture == Gesture.PINCH and self.state == "PINCHED":
+        if new_gesture is Gesture.PINCH and self._state is State.PINCHED:
              return Gesture.PINCH
         
         if self.gesture_hold_frames >= self.min_hold_frames:
             return new_gesture
             
         return Gesture.NONE
+    
+    def _on_idle(self, scores: tuple) -> Gesture:
+        """State: IDLE (Hand just appeared)."""
+        self._state = State.HAND_PRESENT
+        return self._on_hand_present(scores)
+    
+    def _on_hand_present(self, scores: tuple) -> Gesture:
+        """State: HAND_PRESENT (Neutral)."""
+        if scores[PINCH_SCORE] > 0.4: # Lowered from 0.5
+            self._state = State.PRE_PINCH
+            return Gesture.NONE
+        if scores[PALM_SCORE] > 0.8:
+            return Gesture.PALM
+        if scores[GRAB_SCORE] > 0.8:
+            return Gesture.GRAB
+        if scores[PEACE_SCORE] > 0.8:
+            return Gesture.PEACE
+        return Gesture.POINT # Default to point
+    
+    def _on_pre_pinch(self, scores: tuple) -> Gesture:
+        """State: PRE_PINCH (Approaching pinch)."""
+        pinch_score = scores[PINCH_SCORE]
+        if pinch_score > 0.7: # Lowered from 0.75
+            # Angle check - Temporarily disabled/relaxed
+            # if self._check_pinch_angle(landmarks): 
+            self._state = State.PINCHED
+        elif pinch_score < 0.3: # Lowered dropout
+            # Aborted pinch
+            self._state = State.HAND_PRESENT
+        
+        # While in pre-pinch, we are technically "POINTING" but careful
+        return Gesture.POINT
+    
+    def _on_pinched(self, scores: tuple) -> Gesture:
+        """State: PINCHED (Active action)."""
+        if scores[PINCH_SCORE] < 0.5: # Released (Lowered from 0.6 to match easier entry)
+            self._state = State.RELEASE
+            return Gesture.NONE
+        return Gesture.PINCH
+    
+    def _on_release(self, scores: tuple) -> Gesture:
+        """State: RELEASE (Hysteresis / Cooldown)."""
+        # Require full release first, so a fast re-pinch (> 0.8) is ignored
+        if scores[PINCH_SCORE] < 0.3: # Fully opened
+            self._state = State.HAND_PRESENT
+        
+        # Show Point during release
+        return Gesture.POINT
 
-    def _get_hand_scale(self, landmarks) -> float:
-        """Calculate hand scale for normalization.
+    def _get_hand_scale_sq(self, lm: np.ndarray) -> float:
+        """Calculate squared hand scale for normalization.
         
         Uses max of Wrist->IndexMCP or Wrist->MiddleMCP to be robust.
+        Kept squared so the only sqrt left is the one on the pinch ratio.
         """
-        wrist = landmarks[WRIST]
-        index_mcp = landmarks[INDEX_MCP]
-        middle_mcp = landmarks[MIDDLE_MCP]
+        wrist = lm[WRIST]
+        index_mcp = lm[INDEX_MCP]
+        middle_mcp = lm[MIDDLE_MCP]
         
-        d1 = self._dist(wrist, index_mcp)
-        d2 = self._dist(wrist, middle_mcp)
+        d1_sq = self._dist_sq(wrist, index_mcp)
+        d2_sq = self._dist_sq(wrist, middle_mcp)
         
-        return max(d1, d2, 0.01) # Avoid div by zero
+        return max(d1_sq, d2_sq, 0.0001) # Avoid div by zero (0.01 squared)
 
-    def _get_gesture_scores(self, landmarks, scale: float) -> dict:
-        """Compute 0-1 confidence scores for all gestures."""
-        scores = {}
+    def _get_gesture_scores(self, lm: np.ndarray, scale_sq: float) -> tuple:
+        """Compute 0-1 confidence scores for all gestures.
         
+        Returns:
+            tuple: (pinch, palm, grab, peace), see SCORE_NAMES
+        """
         # --- Pinch Score ---
-        # Distance between thumb tip and index tip
-        pinch_dist = self._dist(landmarks[THUMB_TIP], landmarks[INDEX_TIP])
-        norm_pinch = pinch_dist / scale
+        # Distance between thumb tip and index tip (one sqrt on the ratio)
+        pinch_dist_sq = self._dist_sq(lm[THUMB_TIP], lm[INDEX_TIP])
+        norm_pinch = math.sqrt(pinch_dist_sq / scale_sq)
         # Map 0.05..0.2 normalized distance to 1.0..0.0 score
         # Using 0.2 as max distance for pinch
         # Tighter threshold for state machine logic
         # RELAXED to 0.5 to make pinching easier (User Request)
-        scores["pinch"] = max(0, min(1, 1 - (norm_pinch / 0.5)))  
+        pinch = max(0, min(1, 1 - (norm_pinch / 0.5)))
         
         # --- Finger Extensions ---
-        # Check extensions
-        fingers = ["index", "middle", "ring", "pinky"]
-        ext_states = [self._is_finger_extended(landmarks, f) for f in fingers]
+        # Check extensions (one vectorized compare over all four fingers)
+        ext_states = self._fingers_extended(lm).tolist()
         ext_count = sum(ext_states)
-        thumb_ext = self._is_thumb_extended(landmarks)
+        thumb_ext = self._is_thumb_extended(lm)
         
         # --- Palm Score ---
         # All fingers + thumb extended
         palm_conf = ext_count / 4.0
         if thumb_ext: palm_conf = (palm_conf + 1) / 2.0
-        scores["palm"] = 1.0 if (ext_count == 4 and thumb_ext) else 0.0
+        palm = 1.0 if (ext_count == 4 and thumb_ext) else 0.0
         
         # --- Grab Score ---
         # No fingers extended
-        scores["grab"] = 1.0 if (ext_count == 0 and not thumb_ext) else 0.0
+        grab = 1.0 if (ext_count == 0 and not thumb_ext) else 0.0
         
         # --- Peace Score ---
         # Index + Middle only
         is_peace = ext_states[0] and ext_states[1] and not ext_states[2] and not ext_states[3]
-        scores["peace"] = 1.0 if is_peace else 0.0
+        peace = 1.0 if is_peace else 0.0
         
-        return scores
+        return pinch, palm, grab, peace
 
-    def _check_pinch_angle(self, landmarks) -> bool:
+    def _check_pinch_angle(self, lm: np.ndarray) -> bool:
         """Check if thumb and index are facing each other using dot product."""
         # Vector 1: Thumb PIP -> Tip
-        thumb_dir = self._vec(landmarks[THUMB_IP], landmarks[THUMB_TIP])
+        thumb_dir = self._vec(lm[THUMB_IP], lm[THUMB_TIP])
         # Vector 2: Index PIP -> Tip
-        index_dir = self._vec(landmarks[INDEX_PIP], landmarks[INDEX_TIP])
+        index_dir = self._vec(lm[INDEX_PIP], lm[INDEX_TIP])
         
         # Normalize
         t_mag = np.linalg.norm(thumb_dir)
@@ -214,61 +355,55 @@ class GestureDetector:
         dot = np.dot(thumb_norm, index_norm)
         return True # dot < 0.5 # Relaxed check for now
         
-    def _dist(self, p1, p2) -> float:
-        return np.sqrt((p1.x-p2.x)**2 + (p1.y-p2.y)**2 + (p1.z-p2.z)**2)
+    def _dist_sq(self, p1: np.ndarray, p2: np.ndarray) -> float:
+        dx = float(p1[0] - p2[0])
+        dy = float(p1[1] - p2[1])
+        dz = float(p1[2] - p2[2])
+        return dx*dx + dy*dy + dz*dz
+    
+    def _dist(self, p1: np.ndarray, p2: np.ndarray) -> float:
+        return math.sqrt(self._dist_sq(p1, p2))
         
-    def _vec(self, p1, p2):
-        return np.array([p2.x-p1.x, p2.y-p1.y, p2.z-p1.z])
+    def _vec(self, p1: np.ndarray, p2: np.ndarray) -> np.ndarray:
+        return p2 - p1
     
-    def _is_finger_extended(self, landmarks, finger: str) -> bool:
-        """Check if a finger is extended.
+    def _fingers_extended(self, lm: np.ndarray) -> np.ndarray:
+        """Check which of index/middle/ring/pinky are extended.
         
         Uses the y-position comparison: if tip is above PIP joint, finger is extended.
         (In image coordinates, smaller y = higher position)
-        """
-        finger_tips = {
-            "index": (INDEX_MCP, INDEX_PIP, INDEX_TIP),
-            "middle": (MIDDLE_MCP, MIDDLE_PIP, MIDDLE_TIP),
-            "ring": (RING_MCP, RING_PIP, RING_TIP),
-            "pinky": (PINKY_MCP, PINKY_PIP, PINKY_TIP),
-        }
-        
-        mcp, pip, tip = finger_tips[finger]
         
+        Returns:
+            np.ndarray: 4 bools in (index, middle, ring, pinky) order
+        """
         # Get y-coordinates (smaller = higher in image)
-        mcp_y = landmarks[mcp].y
-        pip_y = landmarks[pip].y
-        tip_y = landmarks[tip].y
+        mcp_y = lm[self._mcp_idx, 1]
+        pip_y = lm[self._pip_idx, 1]
+        tip_y = lm[self._tip_idx, 1]
         
         # Finger is extended if tip is significantly above PIP
         # and the finger is relatively straight (tip above MCP)
-        return tip_y < pip_y - self.curl_threshold and tip_y < mcp_y
+        return (tip_y < pip_y - self.curl_threshold) & (tip_y < mcp_y)
     
-    def _is_thumb_extended(self, landmarks) -> bool:
+    def _is_thumb_extended(self, lm: np.ndarray) -> bool:
         """Check if thumb is extended (opened away from palm)."""
         # Compare thumb tip x-position with thumb MCP
         # For right hand: extended thumb has tip to the left (smaller x)
         # We use the index MCP as reference
-        thumb_tip_x = landmarks[THUMB_TIP].x
-        thumb_mcp_x = landmarks[THUMB_MCP].x
-        index_mcp_x = landmarks[INDEX_MCP].x
+        thumb_tip_x = lm[THUMB_TIP, 0]
+        thumb_mcp_x = lm[THUMB_MCP, 0]
+        index_mcp_x = lm[INDEX_MCP, 0]
         
         # Thumb is extended if tip is farther from index than MCP is
         thumb_tip_dist = abs(thumb_tip_x - index_mcp_x)
         thumb_mcp_dist = abs(thumb_mcp_x - index_mcp_x)
         
-        return thumb_tip_dist > thumb_mcp_dist + 0.05
+        return bool(thumb_tip_dist > thumb_mcp_dist + 0.05)
     
     def _get_pinch_distance(self, landmarks) -> float:
         """Get distance between thumb tip and index tip (normalized)."""
-        thumb = landmarks[THUMB_TIP]
-        index = landmarks[INDEX_TIP]
-        
-        dx = thumb.x - index.x
-        dy = thumb.y - index.y
-        dz = thumb.z - index.z
-        
-        return np.sqrt(dx*dx + dy*dy + dz*dz)
+        lm = landmarks_to_array(landmarks, self._lm)
+        return self._dist(lm[THUMB_TIP], lm[INDEX_TIP])
     
     def get_index_tip_position(self, landmarks) -> Optional[tuple]:
         """Get normalized position of index finger tip.
@@ -279,8 +414,8 @@ class GestureDetector:
         if landmarks is None:
             return None
         
-        tip = landmarks[INDEX_TIP]
-        return (tip.x, tip.y, tip.z)
+        row = landmarks_to_array(landmarks, self._lm)[INDEX_TIP]
+        return (float(row[0]), float(row[1]), float(row[2]))
     
     def get_palm_center(self, landmarks) -> Optional[tuple]:
         """Get approximate center of palm.
@@ -292,9 +427,7 @@ class GestureDetector:
             return None
         
         # Average of wrist and MCP joints
-        points = [WRIST, INDEX_MCP, MIDDLE_MCP, RING_MCP, PINKY_MCP]
-        x = sum(landmarks[i].x for i in points) / len(points)
-        y = sum(landmarks[i].y for i in points) / len(points)
-        z = sum(landmarks[i].z for i in points) / len(points)
+        lm = landmarks_to_array(landmarks, self._lm)
+        x, y, z = lm[self._palm_idx].mean(axis=0)
         
-        return (x, y, z)
+        return (float(x), float(y), float(z))
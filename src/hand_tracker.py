@@ -1,4 +1,6 @@
 """Hand tracking module using MediaPipe."""
+import threading
+import time
 import cv2
 import mediapipe as mp
 from mediapipe.tasks import python
@@ -6,60 +8,122 @@ from mediapipe.tasks.python import vision
 import numpy as np
 from pathlib import Path
 
+from .gesture_detector import landmarks_to_array, NUM_LANDMARKS, WRIST
+from .jit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True, fastmath=True)
+def _smooth_kernel(curr, prev, alpha, jump_thr_sq, out):
+    """Compiled selective EMA over (21, 3) arrays; `out` may alias `prev`."""
+    for i in range(curr.shape[0]):
+        dx = curr[i, 0] - prev[i, 0]
+        dy = curr[i, 1] - prev[i, 1]
+        dz = curr[i, 2] - prev[i, 2]
+        if dx*dx + dy*dy + dz*dz > jump_thr_sq:
+            for j in range(3):
+                out[i, j] = curr[i, j]
+        else:
+            for j in range(3):
+                out[i, j] = alpha * curr[i, j] + (1.0 - alpha) * prev[i, j]
 
 
 class LandmarkSmoother:
     """Applies Exponential Moving Average (EMA) to landmarks."""
     
-    def __init__(self, alpha: float = 0.7, jump_threshold: float = 0.1):
+    def __init__(self, alpha: float = 0.7, jump_threshold: float = 0.1,
+                 use_numba: bool = True):
+        """Initialize the smoother.
+        
+        Args:
+            alpha: EMA weight of the new sample
+            jump_threshold: Per-landmark distance above which the EMA resets
+            use_numba: Smooth with the compiled kernel (falls back to NumPy
+                when Numba is not installed)
+        """
         self.alpha = alpha
         self.jump_threshold = jump_threshold
-        self.prev_landmarks = None
-        
-    def update(self, current_landmarks):
-        """Smooth landmarks using EMA."""
-        if self.prev_landmarks is None:
-            self.prev_landmarks = current_landmarks
-            return current_landmarks
-            
-        smoothed = []
-        for i, curr in enumerate(current_landmarks):
-            prev = self.prev_landmarks[i]
-            
-            # Calculate distance
-            dx = curr.x - prev.x
-            dy = curr.y - prev.y
-            dz = curr.z - prev.z
-            dist = np.sqrt(dx*dx + dy*dy + dz*dz)
-            
-            # Selective EMA: Reset if jump is too large (tracking glitch)
-            if dist > self.jump_threshold:
-                new_point = curr
-            else:
-                # Smooth
-                new_x = self.alpha * curr.x + (1 - self.alpha) * prev.x
-                new_y = self.alpha * curr.y + (1 - self.alpha) * prev.y
-                new_z = self.alpha * curr.z + (1 - self.alpha) * prev.z
-                
-                # Create a simple object with x,y,z attributes to mimic MediaPipe landmark
-                new_point = type(curr)(x=new_x, y=new_y, z=new_z, 
-                                     visibility=curr.visibility, 
-                                     presence=curr.presence)
-            
-            smoothed.append(new_point)
-            
-        self.prev_landmarks = smoothed
-        return smoothed
+        self._jump_thr_sq = jump_threshold * jump_threshold
+        self.use_numba = use_numba and NUMBA_AVAILABLE
+        self.prev_xyz = None  # (21, 3) float32, last smoothed landmarks
+    
+    def warmup(self):
+        """Compile the Numba kernel ahead of the first detected hand."""
+        if not self.use_numba:
+            return
+        dummy = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        _smooth_kernel(dummy, dummy, self.alpha, self._jump_thr_sq, dummy)
+        
+    def update(self, current_landmarks) -> np.ndarray:
+        """Smooth landmarks using EMA.
+        
+        Args:
+            current_landmarks: MediaPipe hand landmarks or (21, 3) array
+            
+        Returns:
+            np.ndarray: (21, 3) smoothed landmarks (owned by the smoother)
+        """
+        curr = landmarks_to_array(current_landmarks)
+        if self.prev_xyz is None:
+            self.prev_xyz = np.array(curr, dtype=np.float32)
+            return self.prev_xyz
+        
+        if self.use_numba:
+            # Updated in place: no temporaries, no per-frame allocation
+            _smooth_kernel(curr, self.prev_xyz, self.alpha, self._jump_thr_sq, self.prev_xyz)
+            return self.prev_xyz
+        
+        # Per-landmark squared distance (all 21 points at once)
+        diff = curr - self.prev_xyz
+        dist_sq = np.einsum('ij,ij->i', diff, diff)
+        
+        # Selective EMA: Reset if jump is too large (tracking glitch)
+        jumped = dist_sq > self._jump_thr_sq
+        smoothed = self.alpha * curr + (1 - self.alpha) * self.prev_xyz
+        self.prev_xyz = np.where(jumped[:, None], curr, smoothed).astype(np.float32)
+        return self.prev_xyz
 
 
 class HandTracker:
     """Tracks hand landmarks using MediaPipe Hand Landmarker."""
     
-    def __init__(self, model_path: str = None):
+    # Hand connections as polyline chains (covers all 23 MediaPipe edges)
+    HAND_CHAINS = (
+        np.array([0, 1, 2, 3, 4]),  # Thumb
+        np.array([0, 5, 6, 7, 8]),  # Index
+        np.array([0, 9, 10, 11, 12]),  # Middle
+        np.array([0, 13, 14, 15, 16]),  # Ring
+        np.array([0, 17, 18, 19, 20]),  # Pinky
+        np.array([5, 9, 13, 17]),  # Palm
+    )
+    
+    def __init__(self, model_path: str = None, num_hands: int = 1,
+                 min_detection_confidence: float = 0.5,
+                 min_presence_confidence: float = 0.5,
+                 min_tracking_confidence: float = 0.5,
+                 infer_every: int = 2,
+                 inference_scale: float = 0.5,
+                 capture_size: tuple = (640, 480),
+                 capture_fps: int = 30):
         """Initialize the hand tracker.
         
+        VIDEO running mode tracks the hand from the previous frame's
+        landmarks and only re-runs the palm detector when the presence or
+        tracking confidence drops below its threshold, so lower thresholds
+        mean fewer detector passes.
+        
         Args:
             model_path: Path to hand_landmarker.task model file.
+            num_hands: Maximum number of hands to track
+            min_detection_confidence: Palm detector confidence threshold
+            min_presence_confidence: Hand presence threshold before falling
+                back to the palm detector
+            min_tracking_confidence: Landmark tracking confidence threshold
+            infer_every: Run MediaPipe on every Nth camera frame and
+                interpolate landmarks on the frames in between
+            inference_scale: Resize factor for the frame fed to MediaPipe
+                (landmarks are normalized, so no rescaling is needed)
+            capture_size: Requested (width, height) from the webcam
+            capture_fps: Requested webcam frame rate
         """
         if model_path is None:
             # Look for model in project root
@@ -69,63 +133,282 @@ class HandTracker:
         options = vision.HandLandmarkerOptions(
             base_options=base_options,
             running_mode=vision.RunningMode.VIDEO,
-            num_hands=1,
-            min_hand_detection_confidence=0.7,
-            min_tracking_confidence=0.7
+            num_hands=num_hands,
+            min_hand_detection_confidence=min_detection_confidence,
+            min_hand_presence_confidence=min_presence_confidence,
+            min_tracking_confidence=min_tracking_confidence
         )
         
         self.landmarker = vision.HandLandmarker.create_from_options(options)
         self.cap = cv2.VideoCapture(0)
+        
+        # Compressed MJPG at a modest resolution keeps USB bandwidth and
+        # decode cost down; a one-frame driver buffer avoids stale frames.
+        # Drivers may ignore any of these, which is harmless.
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, capture_size[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, capture_size[1])
+        self.cap.set(cv2.CAP_PROP_FPS, capture_fps)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         self.frame_timestamp_ms = 0
         
         self.smoother = LandmarkSmoother(alpha=0.6, jump_threshold=0.1)
-        self.last_sane_landmarks = None
+        self.smoother.warmup()
+        self.last_sane_wrist = None  # (3,) array, wrist of the last sane detection
         self.last_sane_timestamp = 0
         
+        # Frame skipping: landmarks from the last two inference passes, plus
+        # the buffers handed to consumers (materialized once per camera frame
+        # and shared with GestureDetector, which indexes them without copying).
+        # Three output buffers: one held by the consumer, one published but
+        # not yet taken, one being written by the detection thread.
+        self.infer_every = max(1, infer_every)
+        self._infer_phase = 0
+        self._prev_lm = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._last_lm = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._lm_bufs = [np.zeros((NUM_LANDMARKS, 3), dtype=np.float32) for _ in range(3)]
+        self._raw_lm = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._has_prev_lm = False
+        self._has_last_lm = False
+        
+        self.inference_scale = inference_scale
+        
         if not self.cap.isOpened():
             raise RuntimeError("❌ Webcam not detected")
         
+        # Capture thread state (latest frame slot, guarded by _frame_lock)
+        self._frame_lock = threading.Lock()
+        self._frame_ready = threading.Event()
+        self._frame_wanted = threading.Event()
+        self._frame_wanted.set()
+        self._latest_frame = None
+        self._latest_rgb = None
+        self._latest_timestamp_ms = 0
+        self._rgb_bufs = [np.empty((0, 0, 3), dtype=np.uint8)] * 2
+        self._rgb_index = 0
+        self._frame_seq = 0
+        self._consumed_seq = 0
+        
+        # Detection thread state (latest result slot, guarded by _result_lock)
+        self._result_lock = threading.Lock()
+        self._result_ready = threading.Event()
+        self._latest_result = (None, None)
+        self._result_seq = 0
+        self._taken_seq = 0
+        self._pending_buf = 0
+        self._held_buf = 1
+        self._last_result = (None, None)
+        self._last_frame_sig = None
+        
+        self._running = True
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._detect_thread = threading.Thread(target=self._detect_loop, daemon=True)
+        self._capture_thread.start()
+        self._detect_thread.start()
+        
         print("[OK] Hand tracker initialized")
     
+    def _capture_loop(self):
+        """Producer thread: keep the stream drained, decode only on demand.
+        
+        grab() advances the stream without decoding; retrieve() is only
+        called once the consumer has taken the previous frame. The device
+        is released here, on exit, so it is never released underneath a
+        grab() that is still blocked.
+        """
+        try:
+            self._capture_frames()
+        finally:
+            self.cap.release()
+    
+    def _capture_frames(self):
+        """Grab and convert frames until release() stops the tracker."""
+        while self._running:
+            if not self.cap.grab():
+                time.sleep(0.005)
+                continue
+            if not self._frame_wanted.is_set():
+                continue
+            
+            success, frame = self.cap.retrieve()
+            if not success:
+                continue
+            # Stamped at capture, so skipped or repeated frames still leave
+            # real time between the frames MediaPipe sees
+            timestamp_ms = int(time.monotonic() * 1000)
+            
+            # Flip for mirror effect
+            frame = cv2.flip(frame, 1)
+            
+            # Downscaled RGB copy for MediaPipe; the full-res frame is for display
+            small = frame
+            if self.inference_scale != 1.0:
+                small = cv2.resize(frame, (0, 0), fx=self.inference_scale,
+                                   fy=self.inference_scale, interpolation=cv2.INTER_AREA)
+            rgb_frame = self._next_rgb_buffer(small.shape)
+            cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            
+            with self._frame_lock:
+                self._latest_frame = frame
+                self._latest_rgb = rgb_frame
+                self._latest_timestamp_ms = timestamp_ms
+                self._frame_seq += 1
+                self._frame_wanted.clear()
+                self._frame_ready.set()
+    
+    def _next_rgb_buffer(self, shape):
+        """Return the RGB buffer not currently held by the detection thread.
+        
+        Two preallocated buffers alternate: a new frame is only produced
+        after the detection thread has taken the previous one, so the
+        buffer being written is never the one being detected on.
+        """
+        if self._rgb_bufs[0].shape != shape:
+            self._rgb_bufs = [np.empty(shape, dtype=np.uint8) for _ in range(2)]
+        self._rgb_index ^= 1
+        return self._rgb_bufs[self._rgb_index]
+    
+    def _detect_loop(self):
+        """Worker thread: run MediaPipe on captured frames and publish results.
+        
+        MediaPipe only runs on every `infer_every`-th camera frame; the
+        frames in between get landmarks interpolated between the last two
+        inference results.
+        """
+        while self._running:
+            if not self._frame_ready.wait(timeout=0.1):
+                continue
+            
+            with self._frame_lock:
+                self._frame_ready.clear()
+                if self._frame_seq == self._consumed_seq:
+                    continue
+                frame = self._latest_frame
+                rgb_frame = self._latest_rgb
+                timestamp_ms = self._latest_timestamp_ms
+                self._consumed_seq = self._frame_seq
+                self._frame_wanted.set()
+            
+            # Some UVC cameras repeat frames when polled faster than their
+            # real rate; a repeat keeps the previously published result
+            signature = self._frame_signature(rgb_frame)
+            if signature == self._last_frame_sig:
+                continue
+            self._last_frame_sig = signature
+            
+            if self._infer_phase == 0:
+                landmarks = self._detect(rgb_frame, timestamp_ms)
+                self._prev_lm, self._last_lm = self._last_lm, self._prev_lm
+                self._has_prev_lm = self._has_last_lm
+                self._has_last_lm = landmarks is not None
+                if self._has_last_lm:
+                    np.copyto(self._last_lm, landmarks)
+            
+            # Write into the buffer that is neither held nor pending; only
+            # this thread publishes, so it stays free until we do
+            with self._result_lock:
+                index = ({0, 1, 2} - {self._pending_buf, self._held_buf}).pop()
+            landmarks = self._interpolate_landmarks(self._lm_bufs[index])
+            self._infer_phase = (self._infer_phase + 1) % self.infer_every
+            
+            with self._result_lock:
+                self._latest_result = (frame, landmarks)
+                self._pending_buf = index
+                self._result_seq += 1
+                self._result_ready.set()
+    
+    @staticmethod
+    def _frame_signature(frame: np.ndarray) -> int:
+        """Cheap fingerprint of a frame from a sparse pixel subsample.
+        
+        Hashes the sampled bytes rather than summing them, so frames whose
+        changes cancel out (e.g. a hand moving across a uniform background)
+        still get different signatures.
+        """
+        return hash(frame[8::16, 8::16].tobytes())
+    
     def process(self):
-        """Capture frame and detect hand landmarks.
+        """Fetch the latest (frame, landmarks) from the detection thread.
+        
+        Non-blocking once the first frame has arrived: if no new result has
+        been published since the last call, the previous (frame, landmarks)
+        result is returned as-is (same objects).
+        
+        Returns:
+            tuple: (frame, landmarks) where landmarks is a (21, 3) array or None
+        """
+        if self._last_result[0] is None:
+            self._result_ready.wait(timeout=0.1)
         
+        with self._result_lock:
+            if self._result_seq != self._taken_seq:
+                self._last_result = self._latest_result
+                self._held_buf = self._pending_buf
+                self._taken_seq = self._result_seq
+        return self._last_result
+    
+    def _interpolate_landmarks(self, out: np.ndarray):
+        """Blend from the previous towards the latest inference result.
+        
+        Trails the latest result by up to one inference interval, but moves
+        monotonically so the cursor never jumps back.
+        
+        Args:
+            out: (21, 3) buffer to write into
+            
         Returns:
-            tuple: (frame, landmarks) where landmarks is list of 21 points or None
+            np.ndarray: `out`, or None if there is no hand
         """
-        success, frame = self.cap.read()
-        if not success:
-            return None, None
+        if not self._has_last_lm:
+            return None
         
-        # Flip for mirror effect
-        frame = cv2.flip(frame, 1)
+        t = (self._infer_phase + 1) / self.infer_every
+        if not self._has_prev_lm or t >= 1.0:
+            np.copyto(out, self._last_lm)
+        else:
+            np.subtract(self._last_lm, self._prev_lm, out=out)
+            out *= t
+            out += self._prev_lm
+        return out
+    
+    def _detect(self, rgb_frame, timestamp_ms: int):
+        """Run MediaPipe on an RGB frame.
         
-        # Convert to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        Args:
+            rgb_frame: RGB frame to detect on
+            timestamp_ms: Capture time of the frame
+        
+        Returns:
+            np.ndarray: (21, 3) smoothed landmarks, or None
+        """
+        # mp.Image copies the pixels into its own read-only storage, so a
+        # persistent wrapper cannot track our buffer; the source buffer
+        # itself is preallocated (see _next_rgb_buffer)
         mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
         
-        # Detect
-        self.frame_timestamp_ms += 33  # ~30 FPS
+        # Detect (VIDEO mode needs strictly increasing timestamps)
+        self.frame_timestamp_ms = max(timestamp_ms, self.frame_timestamp_ms + 1)
         result = self.landmarker.detect_for_video(mp_image, self.frame_timestamp_ms)
         
         if result.hand_landmarks:
-            raw_landmarks = result.hand_landmarks[0]
+            raw_xyz = landmarks_to_array(result.hand_landmarks[0], self._raw_lm)
             
             # Apply smoothing and sanity checks
-            if self._is_velocity_sane(raw_landmarks, self.frame_timestamp_ms):
-                landmarks = self.smoother.update(raw_landmarks)
-            else:
-                print("⚠️ Skipped frame: velocity too high")
-                return frame, None
-        else:
-             landmarks = None
+            if self._is_velocity_sane(raw_xyz, self.frame_timestamp_ms):
+                return self.smoother.update(raw_xyz)
+            print("⚠️ Skipped frame: velocity too high")
         
-        return frame, landmarks
+        return None
 
-    def _is_velocity_sane(self, landmarks, timestamp_ms: int) -> bool:
-        """Check if hand movement is within human speed limits."""
-        if self.last_sane_landmarks is None:
-            self.last_sane_landmarks = landmarks
+    def _is_velocity_sane(self, curr_xyz: np.ndarray, timestamp_ms: int) -> bool:
+        """Check if hand movement is within human speed limits.
+        
+        Args:
+            curr_xyz: (21, 3) raw landmarks of the current detection
+            timestamp_ms: Detection timestamp
+        """
+        if self.last_sane_wrist is None:
+            self.last_sane_wrist = curr_xyz[WRIST].copy()
             self.last_sane_timestamp = timestamp_ms
             return True
             
@@ -133,33 +416,26 @@ class HandTracker:
         if dt <= 0: return True
         
         # Check wrist velocity
-        wrist = landmarks[0]
-        prev_wrist = self.last_sane_landmarks[0]
-        
-        dx = wrist.x - prev_wrist.x
-        dy = wrist.y - prev_wrist.y
-        dz = wrist.z - prev_wrist.z
-        
-        dist = np.sqrt(dx*dx + dy*dy + dz*dz)
-        speed = dist / dt  # units per second
+        d = curr_xyz[WRIST] - self.last_sane_wrist
+        dist_sq = float(d @ d)
         
         # Max sane speed (screen width per second)
         MAX_SPEED = 5.0 # Increased from 2.0 to prevent blocking normal usage 
         
-        if speed > MAX_SPEED:
+        # speed = dist / dt > MAX_SPEED, compared squared to skip the sqrt
+        max_dist = MAX_SPEED * dt
+        if dist_sq > max_dist * max_dist:
             return False
             
-        self.last_sane_landmarks = landmarks
+        np.copyto(self.last_sane_wrist, curr_xyz[WRIST])
         self.last_sane_timestamp = timestamp_ms
         return True
-
-
     
     def get_landmark_position(self, landmarks, index: int):
         """Get normalized (x, y, z) position of a landmark.
         
         Args:
-            landmarks: MediaPipe hand landmarks
+            landmarks: MediaPipe hand landmarks or (21, 3) array
             index: Landmark index (0-20)
             
         Returns:
@@ -168,15 +444,15 @@ class HandTracker:
         if landmarks is None:
             return None
         
-        lm = landmarks[index]
-        return (lm.x, lm.y, lm.z)
+        x, y, z = landmarks_to_array(landmarks)[index]
+        return (float(x), float(y), float(z))
     
     def draw_landmarks(self, frame, landmarks):
         """Draw hand landmarks on frame.
         
         Args:
             frame: OpenCV BGR frame
-            landmarks: MediaPipe hand landmarks
+            landmarks: MediaPipe hand landmarks or (21, 3) array
             
         Returns:
             frame: Frame with landmarks drawn
@@ -186,34 +462,28 @@ class HandTracker:
         
         h, w, _ = frame.shape
         
-        # Hand connections
-        connections = [
-            (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
-            (0, 5), (5, 6), (6, 7), (7, 8),  # Index
-            (0, 9), (9, 10), (10, 11), (11, 12),  # Middle
-            (0, 13), (13, 14), (14, 15), (15, 16),  # Ring
-            (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
-            (5, 9), (9, 13), (13, 17)  # Palm
-        ]
-        
-        # Convert to pixel coordinates
-        points = []
-        for lm in landmarks:
-            x = int(lm.x * w)
-            y = int(lm.y * h)
-            points.append((x, y))
-        
-        # Draw connections
-        for start_idx, end_idx in connections:
-            cv2.line(frame, points[start_idx], points[end_idx], (0, 255, 0), 2)
+        # Convert to pixel coordinates (one broadcast for all 21 points)
+        lm = landmarks_to_array(landmarks)
+        points = (lm[:, :2] * (w, h)).astype(np.int32)
+        
+        # Draw connections: one polyline per finger plus the palm
+        cv2.polylines(frame, [points[chain] for chain in self.HAND_CHAINS],
+                      False, (0, 255, 0), 2)
         
         # Draw points
-        for point in points:
-            cv2.circle(frame, point, 5, (255, 0, 0), -1)
+        for x, y in points.tolist():
+            cv2.circle(frame, (x, y), 5, (255, 0, 0), -1)
         
         return frame
     
     def release(self):
         """Release webcam resources."""
-        self.cap.release()
+        self._running = False
+        self._detect_thread.join(timeout=1.0)
+        
+        # The capture thread releases the device itself once it exits
+        self._capture_thread.join(timeout=1.0)
+        if self._capture_thread.is_alive():
+            print("⚠️ Camera still blocked in grab(); it will be released when the read returns")
+            return
         print("✅ Hand tracker released")
@@ -0,0 +1,17 @@
+"""Optional Numba JIT support.
+
+Numba is not a hard dependency. When it is missing, ``njit`` becomes a
+no-op decorator so the same kernels run as plain Python.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
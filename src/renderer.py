@@ -1,13 +1,171 @@
 """OpenGL renderer for voxels and UI."""
+import ctypes
 import pygame
 from pygame.locals import DOUBLEBUF, OPENGL, RESIZABLE
 from OpenGL.GL import *
-from OpenGL.GLU import *
+from OpenGL.GL import shaders
 import numpy as np
 from typing import Tuple, List, Optional
 
 from .camera import Camera
-from .voxel_engine import VoxelEngine
+from .voxel_engine import VoxelEngine, VisibleFaces, FACE_NAMES
+
+
+# Face tables, indexed in the same order as FACE_NAMES
+_FACE_INDEX = {name: i for i, name in enumerate(FACE_NAMES)}
+
+# Quad corners per face, relative to the voxel's min corner (grid cells are
+# size 1.0, so vertices are x..x+1 etc. without any matrix push/pop)
+_FACE_CORNERS = np.array([
+    [(1, 0, 0), (1, 1, 0), (1, 1, 1), (1, 0, 1)],  # right
+    [(0, 0, 0), (0, 0, 1), (0, 1, 1), (0, 1, 0)],  # left
+    [(0, 1, 0), (0, 1, 1), (1, 1, 1), (1, 1, 0)],  # top
+    [(0, 0, 0), (1, 0, 0), (1, 0, 1), (0, 0, 1)],  # bottom
+    [(0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)],  # front
+    [(0, 0, 0), (0, 1, 0), (1, 1, 0), (1, 0, 0)],  # back
+], dtype=np.float32)
+
+_FACE_NORMALS = np.array([
+    (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1),
+], dtype=np.float32)
+
+# Lighting is baked into vertex colors when the mesh is built: one shade per
+# face direction from a fixed world-space directional light towards
+# (20, 30, 20), 0.5 ambient + 0.8 diffuse, clamped to 1. This approximates
+# the old fixed-function look; it does not reproduce its eye-space
+# positional light, which varied with the camera and the vertex position
+_LIGHT_DIR = np.array([20.0, 30.0, 20.0], dtype=np.float32) / np.float32(np.sqrt(1700.0))
+_AMBIENT = 0.5
+_DIFFUSE = 0.8
+_FACE_SHADE = np.minimum(
+    1.0, _AMBIENT + _DIFFUSE * np.maximum(0.0, _FACE_NORMALS @ _LIGHT_DIR)
+).astype(np.float32)
+
+# Quad corner pairs forming the 4 outline edges
+_OUTLINE_EDGES = np.array([0, 1, 1, 2, 2, 3, 3, 0])
+
+# Slight epsilon to prevent z-fighting between outlines and faces
+_OUTLINE_EPSILON = 0.001
+
+# Mip levels generated for the background when it is displayed downscaled
+_BG_MIP_LEVELS = 2
+
+# Fullscreen background: one oversized triangle in clip space, drawn by a
+# shader that ignores the fixed-function matrix stack
+_BG_TRIANGLE = np.array([-1.0, -1.0, 3.0, -1.0, -1.0, 3.0], dtype=np.float32)
+
+_BG_VERTEX_SHADER = """
+#version 120
+varying vec2 uv;
+void main() {
+    // Image rows are top-down, so flip v
+    uv = vec2(gl_Vertex.x * 0.5 + 0.5, 0.5 - gl_Vertex.y * 0.5);
+    gl_Position = vec4(gl_Vertex.xy, 0.0, 1.0);
+}
+"""
+
+_BG_FRAGMENT_SHADER = """
+#version 120
+uniform sampler2D frame;
+varying vec2 uv;
+void main() {
+    gl_FragColor = texture2D(frame, uv);
+}
+"""
+
+# Minimum context is GL 2.1 (GLSL 1.20, VBOs, pixel buffer objects). Mapped
+# PBO uploads and mipmap generation need GL 3.0 or these extensions and
+# are skipped when the context lacks them
+_MAP_RANGE_EXTENSIONS = ("GL_ARB_map_buffer_range",)
+_MIPMAP_EXTENSIONS = ("GL_ARB_framebuffer_object", "GL_EXT_framebuffer_object")
+
+
+def _gl_supports(version: Tuple[int, int], extensions: Tuple[str, ...]) -> bool:
+    """Check the current context for a GL version or any of the extensions."""
+    try:
+        major, minor = glGetString(GL_VERSION).decode().split(" ")[0].split(".")[:2]
+        if (int(major), int(minor)) >= version:
+            return True
+        available = set((glGetString(GL_EXTENSIONS) or b"").decode().split())
+    except (AttributeError, ValueError, GLError):
+        return False
+    return any(ext in available for ext in extensions)
+
+
+# 8-bit color channel -> [0, 1] float lookup table
+_B2F = np.arange(256, dtype=np.float32) * np.float32(1.0 / 255.0)
+
+# Interleaved vertex layout: position (3), color (3) as float32
+_VERTEX_STRIDE = 6 * 4
+
+
+def _face_arrays(faces: List[dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split face or quad dicts into (positions, face indices, shaded colors) arrays."""
+    n = len(faces)
+    positions = np.array([f["pos"] for f in faces], dtype=np.float32).reshape(n, 3)
+    face_ids = np.array([_FACE_INDEX[f["face"]] for f in faces], dtype=np.intp)
+    colors = _B2F[np.array([f["color"] for f in faces], dtype=np.uint8).reshape(n, 3)]
+    colors *= _FACE_SHADE[face_ids][:, None]
+    return positions, face_ids, colors
+
+
+def _build_voxel_mesh(quads: List[dict], faces: VisibleFaces) -> np.ndarray:
+    """Build one interleaved vertex array for the voxel surface and outlines.
+    
+    Args:
+        quads: Merged faces from VoxelEngine.get_greedy_mesh()
+        faces: Per-voxel faces from VoxelEngine.get_visible_faces(), used
+            for the outlines so every voxel keeps its grid lines
+        
+    Returns:
+        np.ndarray: (Q*4 + N*8, 6) float32; Q*4 quad vertices followed by
+            N*8 line vertices
+    """
+    nq, nf = len(quads), len(faces)
+    verts = np.empty((nq * 4 + nf * 8, 6), dtype=np.float32)
+    
+    positions, face_ids, colors = _face_arrays(quads)
+    sizes = np.array([q["size"] for q in quads], dtype=np.float32).reshape(-1, 3)
+    quad_verts = verts[:nq * 4].reshape(nq, 4, 6)
+    quad_verts[:, :, 0:3] = _FACE_CORNERS[face_ids] * sizes[:, None, :] + positions[:, None, :]
+    quad_verts[:, :, 3:6] = colors[:, None, :]
+    
+    # Outlines: epsilon-expanded corners, darker color
+    positions = faces.positions.astype(np.float32)
+    face_ids = faces.face_ids
+    colors = _B2F[faces.colors] * _FACE_SHADE[face_ids][:, None]
+    e = _OUTLINE_EPSILON
+    edges = _FACE_CORNERS[face_ids][:, _OUTLINE_EDGES] * (1 + 2 * e) - e  # (N, 8, 3)
+    line_verts = verts[nq * 4:].reshape(nf, 8, 6)
+    line_verts[:, :, 0:3] = edges + positions[:, None, :]
+    line_verts[:, :, 3:6] = colors[:, None, :] * 0.5
+    
+    return verts
+
+
+def _grid_floor_vertices(size: int, y: float) -> np.ndarray:
+    """Line vertices for the floor grid: (size + 1) lines along X and Z."""
+    i = np.arange(size + 1, dtype=np.float32)
+    zero = np.zeros_like(i)
+    verts = np.empty((size + 1, 4, 6), dtype=np.float32)
+    verts[:, :, 1] = y
+    verts[:, :, 3:6] = (0.3, 0.3, 0.35)
+    # X lines
+    verts[:, 0, 0], verts[:, 0, 2] = zero, i
+    verts[:, 1, 0], verts[:, 1, 2] = size, i
+    # Z lines
+    verts[:, 2, 0], verts[:, 2, 2] = i, zero
+    verts[:, 3, 0], verts[:, 3, 2] = i, size
+    return verts.reshape(-1, 6)
+
+
+def _axes_vertices(size: float) -> np.ndarray:
+    """Line vertices for the X (red), Y (green) and Z (blue) axes."""
+    verts = np.zeros((6, 6), dtype=np.float32)
+    for axis in range(3):
+        verts[2 * axis + 1, axis] = size
+        verts[2 * axis:2 * axis + 2, 3 + axis] = 1.0
+    return verts
 
 
 class Renderer:
@@ -39,15 +197,11 @@ class Renderer:
     def _setup_opengl(self):
         """Configure OpenGL settings."""
         glEnable(GL_DEPTH_TEST)
-        glEnable(GL_LIGHTING)
-        glEnable(GL_LIGHT0)
-        glEnable(GL_COLOR_MATERIAL)
-        glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
         
-        # Light position
-        glLightfv(GL_LIGHT0, GL_POSITION, [20.0, 30.0, 20.0, 1.0])
-        glLightfv(GL_LIGHT0, GL_AMBIENT, [0.3, 0.3, 0.3, 1.0])
-        glLightfv(GL_LIGHT0, GL_DIFFUSE, [0.8, 0.8, 0.8, 1.0])
+        # Tightly packed rows for webcam frames of any width
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        
+        # No fixed-function lighting: voxel shading is baked into the mesh
         
         # Background color (dark gray)
         glClearColor(0.1, 0.1, 0.15, 1.0)
@@ -55,14 +209,43 @@ class Renderer:
         # Update viewport
         self._update_projection()
         
-        # Background texture state
+        # Optional GL 3.0 features (see _MAP_RANGE_EXTENSIONS)
+        self._use_pbo = bool(glMapBufferRange) and _gl_supports((3, 0), _MAP_RANGE_EXTENSIONS)
+        self._use_mipmaps = bool(glGenerateMipmap) and _gl_supports((3, 0), _MIPMAP_EXTENSIONS)
+        
+        # Background texture state (storage allocated once per frame size)
         self.bg_texture = None
+        self._bg_size = None
+        self._bg_mipmapped = False
+        self._bg_pbos = glGenBuffers(2)
+        self._pbo_index = 0
+        self._bg_program = shaders.compileProgram(
+            shaders.compileShader(_BG_VERTEX_SHADER, GL_VERTEX_SHADER),
+            shaders.compileShader(_BG_FRAGMENT_SHADER, GL_FRAGMENT_SHADER),
+        )
+        self._bg_vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self._bg_vbo)
+        glBufferData(GL_ARRAY_BUFFER, _BG_TRIANGLE.nbytes, _BG_TRIANGLE, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        
+        # Last camera view loaded into the modelview matrix
+        self._view_camera = None
+        self._view_revision = -1
+        
+        # Static line geometry (floor grid, axes): key -> (vbo, vertex count)
+        self._static_lines = {}
+        
+        # Voxel mesh buffer (rebuilt when VoxelEngine.revision changes)
+        self._voxel_vbo = None
+        self._face_vertex_count = 0
+        self._line_vertex_count = 0
+        self._mesh_revision = -1
 
     def render_background(self, image_data: np.ndarray):
         """Render image as background.
         
         Args:
-            image_data: RGB numpy array
+            image_data: BGR numpy array (OpenCV layout, uploaded as GL_BGR)
         """
         # Create texture if not exists
         if self.bg_texture is None:
@@ -70,49 +253,86 @@ class Renderer:
             glBindTexture(GL_TEXTURE_2D, self.bg_texture)
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
             glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAX_LEVEL, _BG_MIP_LEVELS)
         
+        image_data = np.ascontiguousarray(image_data)
         h, w, _ = image_data.shape
-        
-        # Select our texture
-        glEnable(GL_TEXTURE_2D)
         glBindTexture(GL_TEXTURE_2D, self.bg_texture)
         
-        # Upload data
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, w, h, 0, GL_RGB, GL_UNSIGNED_BYTE, image_data)
+        # Allocate texture and pixel buffer storage only when the frame size changes
+        if self._bg_size != (w, h):
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB8, w, h, 0, GL_BGR, GL_UNSIGNED_BYTE, None)
+            if self._use_pbo:
+                for pbo in self._bg_pbos:
+                    glBindBuffer(GL_PIXEL_UNPACK_BUFFER, pbo)
+                    glBufferData(GL_PIXEL_UNPACK_BUFFER, image_data.nbytes, None, GL_STREAM_DRAW)
+                glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+            self._bg_size = (w, h)
+        
+        if not self._upload_via_pbo(image_data):
+            glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, w, h, GL_BGR, GL_UNSIGNED_BYTE, image_data)
+        
+        # Mipmaps only pay off when the frame is shown smaller than captured
+        downsampled = self._use_mipmaps and (self.width < w or self.height < h)
+        if downsampled != self._bg_mipmapped:
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER,
+                            GL_LINEAR_MIPMAP_LINEAR if downsampled else GL_LINEAR)
+            self._bg_mipmapped = downsampled
+        if downsampled:
+            glGenerateMipmap(GL_TEXTURE_2D)
+        
+        self.render_background_cached()
+    
+    def _upload_via_pbo(self, image_data: np.ndarray) -> bool:
+        """Upload a frame to the bound background texture through a PBO.
         
-        # Save state
-        glPushAttrib(GL_ENABLE_BIT | GL_DEPTH_BUFFER_BIT | GL_TRANSFORM_BIT)
+        Copies the frame into the next pixel buffer (ping-pong, so we never
+        wait on the DMA still reading the other one), then uploads from it;
+        glTexSubImage2D returns without waiting for the transfer.
         
-        # Switch to 2D projection
-        glMatrixMode(GL_PROJECTION)
-        glPushMatrix()
-        glLoadIdentity()
-        glOrtho(0, 1, 0, 1, -1, 1)
+        Returns:
+            bool: False if PBOs are unsupported or the buffer could not be
+                mapped (the caller then uploads from client memory)
+        """
+        if not self._use_pbo:
+            return False
         
-        glMatrixMode(GL_MODELVIEW)
-        glPushMatrix()
-        glLoadIdentity()
+        h, w, _ = image_data.shape
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, self._bg_pbos[self._pbo_index])
+        self._pbo_index ^= 1
+        ptr = glMapBufferRange(GL_PIXEL_UNPACK_BUFFER, 0, image_data.nbytes,
+                               GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT)
+        if not ptr:
+            # Map failure or lost context: never memmove into NULL
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+            return False
+        
+        ctypes.memmove(ptr, image_data.ctypes.data, image_data.nbytes)
+        glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+        glTexSubImage2D(GL_TEXTURE_2D, 0, 0, 0, w, h, GL_BGR, GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+        return True
+    
+    def render_background_cached(self):
+        """Redraw the last uploaded background without re-uploading it."""
+        if self.bg_texture is None:
+            self.clear()
+            return
         
-        # Disable lighting/depth for background
-        glDisable(GL_LIGHTING)
+        glBindTexture(GL_TEXTURE_2D, self.bg_texture)
+        glUseProgram(self._bg_program)
         glDisable(GL_DEPTH_TEST)
-        glColor3f(1, 1, 1)  # White modulation to show original colors
-        
-        # Draw full screen quad
-        glBegin(GL_QUADS)
-        glTexCoord2f(0, 1); glVertex2f(0, 0)  # Top-Left (image is top-down)
-        glTexCoord2f(1, 1); glVertex2f(1, 0)  # Top-Right
-        glTexCoord2f(1, 0); glVertex2f(1, 1)  # Bottom-Right
-        glTexCoord2f(0, 0); glVertex2f(0, 1)  # Bottom-Left
-        glEnd()
         
-        # Restore state
-        glPopMatrix() # Modelview
-        glMatrixMode(GL_PROJECTION)
-        glPopMatrix() # Projection
-        glPopAttrib()
+        # Draw one triangle covering the screen
+        glBindBuffer(GL_ARRAY_BUFFER, self._bg_vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, ctypes.c_void_p(0))
+        glDrawArrays(GL_TRIANGLES, 0, 3)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
         
-        glDisable(GL_TEXTURE_2D)
+        glUseProgram(0)
+        glEnable(GL_DEPTH_TEST)
         
         # Clear depth buffer so 3D objects draw over it correctly
         glClear(GL_DEPTH_BUFFER_BIT)
@@ -120,8 +340,7 @@ class Renderer:
     def _update_projection(self):
         """Update projection matrix for current window size."""
         glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        gluPerspective(60, self.width / self.height, 0.1, 500.0)
+        glLoadTransposeMatrixf(Camera.perspective(60, self.width / self.height, 0.1, 500.0))
         glMatrixMode(GL_MODELVIEW)
     
     def handle_resize(self, width: int, height: int):
@@ -143,143 +362,100 @@ class Renderer:
     def set_camera(self, camera: Camera):
         """Apply camera transformation.
         
+        The modelview matrix is only reloaded when the camera's view
+        matrix has changed since the last call.
+        
         Args:
             camera: Camera object
         """
-        glLoadIdentity()
-        
-        pos = camera.get_position()
-        target = camera.target
+        view = camera.get_view_matrix()
+        if camera is self._view_camera and camera.view_revision == self._view_revision:
+            return
         
-        gluLookAt(
-            pos[0], pos[1], pos[2],
-            target[0], target[1], target[2],
-            0, 1, 0
-        )
+        glLoadTransposeMatrixf(view)
+        self._view_camera = camera
+        self._view_revision = camera.view_revision
     
     def render_voxels(self, voxel_engine: VoxelEngine):
-        """Render all voxels using face culling.
+        """Render all voxels using face culling and greedy meshing.
+        
+        The merged faces and per-voxel outlines are baked, with lighting,
+        into one vertex buffer that is only rebuilt when the voxel engine
+        changes; each frame is then two glDrawArrays calls (faces + outlines).
         
         Args:
             voxel_engine: VoxelEngine with voxels to render
         """
-        # Use cached visible faces for performance
-        faces = voxel_engine.get_visible_faces()
+        if self._mesh_revision != voxel_engine.revision:
+            self._upload_voxel_mesh(voxel_engine.get_greedy_mesh(),
+                                    voxel_engine.get_visible_faces())
+            self._mesh_revision = voxel_engine.revision
         
-        glBegin(GL_QUADS)
-        for face_data in faces:
-            self._draw_face_primitive(face_data['pos'], face_data['face'], face_data['color'])
-        glEnd()
+        if self._face_vertex_count == 0:
+            return
+        
+        self._bind_vertex_buffer(self._voxel_vbo)
+        
+        glDrawArrays(GL_QUADS, 0, self._face_vertex_count)
         
-        # Draw wireframes in a second pass (optional, but looks nice)
-        # For performance on large grids, you might want to disable this or only draw selected
+        # Wireframes live in the same buffer, right after the faces
         glLineWidth(1.0)
-        glBegin(GL_LINES)
-        for face_data in faces:
-             self._draw_face_outline_primitive(face_data['pos'], face_data['face'], face_data['color'])
-        glEnd()
-
-    def _draw_face_primitive(self, pos: Tuple[int, int, int], face: str, color: Tuple[int, int, int]):
-        """Draw a single face quad (must be called inside glBegin(GL_QUADS))."""
-        x, y, z = pos
-        r, g, b = color[0] / 255.0, color[1] / 255.0, color[2] / 255.0
-        glColor3f(r, g, b)
+        glDrawArrays(GL_LINES, self._face_vertex_count, self._line_vertex_count)
         
-        # Vertices relative to center (0,0,0) -> (x+0.5, y+0.5, z+0.5) translation
-        # To avoid constant glPushMatrix/pop, we just add the offset directly
-        # Grid cells are size 1.0, centered at x+0.5
-        
-        # Coordinates
-        x0, x1 = x, x + 1
-        y0, y1 = y, y + 1
-        z0, z1 = z, z + 1
-        
-        if face == "front":
-            glNormal3f(0, 0, 1)
-            glVertex3f(x0, y0, z1)
-            glVertex3f(x1, y0, z1)
-            glVertex3f(x1, y1, z1)
-            glVertex3f(x0, y1, z1)
-        
-        elif face == "back":
-            glNormal3f(0, 0, -1)
-            glVertex3f(x0, y0, z0)
-            glVertex3f(x0, y1, z0)
-            glVertex3f(x1, y1, z0)
-            glVertex3f(x1, y0, z0)
-            
-        elif face == "top":
-            glNormal3f(0, 1, 0)
-            glVertex3f(x0, y1, z0)
-            glVertex3f(x0, y1, z1)
-            glVertex3f(x1, y1, z1)
-            glVertex3f(x1, y1, z0)
-            
-        elif face == "bottom":
-            glNormal3f(0, -1, 0)
-            glVertex3f(x0, y0, z0)
-            glVertex3f(x1, y0, z0)
-            glVertex3f(x1, y0, z1)
-            glVertex3f(x0, y0, z1)
-            
-        elif face == "right":
-            glNormal3f(1, 0, 0)
-            glVertex3f(x1, y0, z0)
-            glVertex3f(x1, y1, z0)
-            glVertex3f(x1, y1, z1)
-            glVertex3f(x1, y0, z1)
-            
-        elif face == "left":
-            glNormal3f(-1, 0, 0)
-            glVertex3f(x0, y0, z0)
-            glVertex3f(x0, y0, z1)
-            glVertex3f(x0, y1, z1)
-            glVertex3f(x0, y1, z0)
-
-    def _draw_face_outline_primitive(self, pos: Tuple[int, int, int], face: str, color: Tuple[int, int, int]):
-        """Draw outline for a single face (must be called inside glBegin(GL_LINES))."""
-        x, y, z = pos
-        # Darker color for outline
-        r, g, b = color[0] / 255.0 * 0.5, color[1] / 255.0 * 0.5, color[2] / 255.0 * 0.5
-        glColor3f(r, g, b)
+        self._unbind_vertex_buffer()
+    
+    def _upload_voxel_mesh(self, quads: List[dict], faces: VisibleFaces):
+        """Rebuild the voxel vertex buffer (faces followed by outlines)."""
+        verts = _build_voxel_mesh(quads, faces)
         
-        # Slight epsilon to prevent z-fighting
-        e = 0.001
-        x0, x1 = x - e, x + 1 + e
-        y0, y1 = y - e, y + 1 + e
-        z0, z1 = z - e, z + 1 + e
-        
-        if face == "front":
-            glVertex3f(x0, y0, z1); glVertex3f(x1, y0, z1)
-            glVertex3f(x1, y0, z1); glVertex3f(x1, y1, z1)
-            glVertex3f(x1, y1, z1); glVertex3f(x0, y1, z1)
-            glVertex3f(x0, y1, z1); glVertex3f(x0, y0, z1)
-        elif face == "back":
-            glVertex3f(x0, y0, z0); glVertex3f(x1, y0, z0)
-            glVertex3f(x1, y0, z0); glVertex3f(x1, y1, z0)
-            glVertex3f(x1, y1, z0); glVertex3f(x0, y1, z0)
-            glVertex3f(x0, y1, z0); glVertex3f(x0, y0, z0)
-        elif face == "top":
-            glVertex3f(x0, y1, z0); glVertex3f(x0, y1, z1)
-            glVertex3f(x0, y1, z1); glVertex3f(x1, y1, z1)
-            glVertex3f(x1, y1, z1); glVertex3f(x1, y1, z0)
-            glVertex3f(x1, y1, z0); glVertex3f(x0, y1, z0)
-        elif face == "bottom":
-            glVertex3f(x0, y0, z0); glVertex3f(x1, y0, z0)
-            glVertex3f(x1, y0, z0); glVertex3f(x1, y0, z1)
-            glVertex3f(x1, y0, z1); glVertex3f(x0, y0, z1)
-            glVertex3f(x0, y0, z1); glVertex3f(x0, y0, z0)
-        elif face == "right":
-            glVertex3f(x1, y0, z0); glVertex3f(x1, y1, z0)
-            glVertex3f(x1, y1, z0); glVertex3f(x1, y1, z1)
-            glVertex3f(x1, y1, z1); glVertex3f(x1, y0, z1)
-            glVertex3f(x1, y0, z1); glVertex3f(x1, y0, z0)
-        elif face == "left":
-            glVertex3f(x0, y0, z0); glVertex3f(x0, y1, z0)
-            glVertex3f(x0, y1, z0); glVertex3f(x0, y1, z1)
-            glVertex3f(x0, y1, z1); glVertex3f(x0, y0, z1)
-            glVertex3f(x0, y0, z1); glVertex3f(x0, y0, z0)
-
+        if self._voxel_vbo is None:
+            self._voxel_vbo = glGenBuffers(1)
+        
+        self._face_vertex_count = len(quads) * 4
+        self._line_vertex_count = len(faces) * 8
+        if self._face_vertex_count == 0:
+            return
+        
+        glBindBuffer(GL_ARRAY_BUFFER, self._voxel_vbo)
+        glBufferData(GL_ARRAY_BUFFER, verts.nbytes, verts, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+    
+    def _bind_vertex_buffer(self, vbo):
+        """Bind a VBO of interleaved [position, color] vertices for drawing."""
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(3, GL_FLOAT, _VERTEX_STRIDE, ctypes.c_void_p(0))
+        glColorPointer(3, GL_FLOAT, _VERTEX_STRIDE, ctypes.c_void_p(12))
+    
+    def _unbind_vertex_buffer(self):
+        """Undo _bind_vertex_buffer."""
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+    
+    def _draw_static_lines(self, key: tuple, build, width: float):
+        """Draw line geometry that is uploaded once per key.
+        
+        Args:
+            key: Cache key identifying the geometry (e.g. kind + parameters)
+            build: Callable returning (N, 6) float32 [position, color] vertices
+            width: Line width
+        """
+        entry = self._static_lines.get(key)
+        if entry is None:
+            verts = build()
+            vbo = glGenBuffers(1)
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glBufferData(GL_ARRAY_BUFFER, verts.nbytes, verts, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            entry = self._static_lines[key] = (vbo, len(verts))
+        
+        vbo, count = entry
+        glLineWidth(width)
+        self._bind_vertex_buffer(vbo)
+        glDrawArrays(GL_LINES, 0, count)
+        self._unbind_vertex_buffer()
     
     def render_cursor(self, position: Tuple[int, int, int], color: Tuple[int, int, int] = (255, 255, 0)):
         """Render 3D cursor at grid position.
@@ -295,7 +471,6 @@ class Renderer:
         glTranslatef(x + 0.5, y + 0.5, z + 0.5)
         
         # Draw wireframe cube for cursor
-        glDisable(GL_LIGHTING)
         glColor3f(r, g, b)
         glLineWidth(2.0)
         
@@ -318,7 +493,6 @@ class Renderer:
         glVertex3f(-s, -s, s); glVertex3f(-s, s, s)
         glEnd()
         
-        glEnable(GL_LIGHTING)
         glPopMatrix()
     
     def render_grid_floor(self, size: int = 16, y: float = -0.01):
@@ -328,21 +502,7 @@ class Renderer:
             size: Grid size
             y: Y position of floor
         """
-        glDisable(GL_LIGHTING)
-        glColor3f(0.3, 0.3, 0.35)
-        glLineWidth(1.0)
-        
-        glBegin(GL_LINES)
-        for i in range(size + 1):
-            # X lines
-            glVertex3f(0, y, i)
-            glVertex3f(size, y, i)
-            # Z lines
-            glVertex3f(i, y, 0)
-            glVertex3f(i, y, size)
-        glEnd()
-        
-        glEnable(GL_LIGHTING)
+        self._draw_static_lines(("floor", size, y), lambda: _grid_floor_vertices(size, y), 1.0)
     
     def render_axes(self, size: float = 3.0):
         """Render coordinate axes at origin.
@@ -350,25 +510,7 @@ class Renderer:
         Args:
             size: Length of axes
         """
-        glDisable(GL_LIGHTING)
-        glLineWidth(2.0)
-        
-        glBegin(GL_LINES)
-        # X axis - Red
-        glColor3f(1, 0, 0)
-        glVertex3f(0, 0, 0)
-        glVertex3f(size, 0, 0)
-        # Y axis - Green
-        glColor3f(0, 1, 0)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, size, 0)
-        # Z axis - Blue
-        glColor3f(0, 0, 1)
-        glVertex3f(0, 0, 0)
-        glVertex3f(0, 0, size)
-        glEnd()
-        
-        glEnable(GL_LIGHTING)
+        self._draw_static_lines(("axes", size), lambda: _axes_vertices(size), 2.0)
     
     def swap(self):
         """Swap buffers to display rendered frame."""
@@ -1,12 +1,92 @@
 """On-screen HUD for displaying gesture and tool info."""
+import string
+import numpy as np
 import pygame
 from pygame.locals import *
 from OpenGL.GL import *
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 from .gesture_detector import Gesture
 
 
+# Characters baked into the glyph atlases (anything else draws as '?')
+ATLAS_CHARS = "".join(ch for ch in string.printable if ch not in "\t\n\r\x0b\x0c")
+ATLAS_WIDTH = 512
+
+# Glyph metrics: (width, height, u0, v0, u1, v1)
+Glyph = Tuple[float, float, float, float, float, float]
+
+# Laid-out text: (atlas texture_id, positions, texcoords)
+TextLayout = Tuple[int, np.ndarray, np.ndarray]
+
+
+def build_glyph_atlas(font: pygame.font.Font) -> Tuple[pygame.Surface, Dict[str, Glyph]]:
+    """Rasterize ATLAS_CHARS once into a white-on-transparent atlas.
+    
+    Glyphs are shelf-packed in rows with a 1px gutter so linear filtering
+    does not bleed between neighbours.
+    
+    Args:
+        font: Font to rasterize
+        
+    Returns:
+        tuple: (atlas surface, {char: glyph metrics})
+    """
+    surfaces = {ch: font.render(ch, True, (255, 255, 255)) for ch in ATLAS_CHARS}
+    line_height = max(surface.get_height() for surface in surfaces.values())
+    
+    placements = {}
+    x = y = 0
+    for ch, surface in surfaces.items():
+        if x + surface.get_width() > ATLAS_WIDTH:
+            x, y = 0, y + line_height + 1
+        placements[ch] = (x, y)
+        x += surface.get_width() + 1
+    
+    height = 1
+    while height < y + line_height:
+        height *= 2
+    
+    atlas = pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA)
+    atlas.fill((255, 255, 255, 0))
+    glyphs = {}
+    for ch, surface in surfaces.items():
+        px, py = placements[ch]
+        atlas.blit(surface, (px, py), special_flags=pygame.BLEND_RGBA_MAX)
+        w, h = surface.get_size()
+        glyphs[ch] = (w, h, px / ATLAS_WIDTH, py / height,
+                      (px + w) / ATLAS_WIDTH, (py + h) / height)
+    
+    return atlas, glyphs
+
+
+def layout_text(text: str, glyphs: Dict[str, Glyph], x: float, y: float
+                ) -> Tuple[np.ndarray, np.ndarray]:
+    """Lay out one quad per character from atlas glyph metrics.
+    
+    Args:
+        text: String to lay out
+        glyphs: Glyph metrics from build_glyph_atlas()
+        x, y: Top-left corner in screen pixels
+        
+    Returns:
+        tuple: (positions, texcoords), each (len(text) * 4, 2) float32
+    """
+    fallback = glyphs["?"]
+    metrics = np.array([glyphs.get(ch, fallback) for ch in text], dtype=np.float32).reshape(-1, 6)
+    w, h, u0, v0, u1, v1 = metrics.T
+    
+    x0 = x + np.cumsum(w) - w
+    x1 = x0 + w
+    y0 = np.full_like(x0, y)
+    y1 = y0 + h
+    
+    # Corners in order: top-left, top-right, bottom-right, bottom-left
+    positions = np.stack([x0, y0, x1, y0, x1, y1, x0, y1], axis=1).reshape(-1, 2)
+    texcoords = np.stack([u0, v0, u1, v0, u1, v1, u0, v1], axis=1).reshape(-1, 2)
+    return positions, texcoords
+
+
 class HUD:
     """On-screen heads-up display."""
     
@@ -29,6 +109,9 @@ class HUD:
         Gesture.PEACE: "Peace (Color)",
     }
     
+    CONTROLS_TEXT = "Q: Quit | Z: Undo | C: Change Color | R: Reset View"
+    CONTROLS_COLOR = (150, 150, 150)
+    
     def __init__(self, screen_width: int, screen_height: int):
         """Initialize HUD.
         
@@ -47,6 +130,20 @@ class HUD:
         except:
             self.font = pygame.font.SysFont('arial', 28)
             self.small_font = pygame.font.SysFont('arial', 18)
+        
+        # Last (gesture, cursor_pos, voxel_count) and the text layouts built from it
+        self._last_state = None
+        self._state_labels = ()
+        
+        # One glyph atlas texture per font, uploaded once: small -> (texture_id, glyphs)
+        self._atlases = {
+            False: self._upload_atlas(self.font),
+            True: self._upload_atlas(self.small_font),
+        }
+        
+        # Constant labels, laid out once against their atlas
+        self._color_label = self._layout("Color:")
+        self._controls_label = self._layout(self.CONTROLS_TEXT, small=True)
     
     def resize(self, width: int, height: int):
         """Update screen dimensions."""
@@ -63,6 +160,18 @@ class HUD:
             current_color: Currently selected color
             voxel_count: Number of voxels placed
         """
+        # Rebuild the strings and their layouts only when the displayed
+        # state changes
+        state = (gesture, cursor_pos, voxel_count)
+        if state != self._last_state:
+            self._last_state = state
+            self._state_labels = (
+                self._layout(f"Gesture: {self.GESTURE_NAMES.get(gesture, 'Unknown')}"),
+                self._layout(f"Cursor: ({cursor_pos[0]}, {cursor_pos[1]}, {cursor_pos[2]})"),
+                self._layout(f"Voxels: {voxel_count}"),
+            )
+        gesture_label, pos_label, count_label = self._state_labels
+        
         # Switch to 2D rendering
         self._begin_2d()
         
@@ -70,25 +179,22 @@ class HUD:
         self._draw_panel(10, 10, 250, 140, (20, 20, 30, 180))
         
         # Gesture status
-        gesture_text = f"Gesture: {self.GESTURE_NAMES.get(gesture, 'Unknown')}"
-        self._draw_text(gesture_text, 20, 20, (255, 255, 255))
+        self._draw_text(gesture_label, 20, 20, (255, 255, 255))
         
         # Cursor position
-        pos_text = f"Cursor: ({cursor_pos[0]}, {cursor_pos[1]}, {cursor_pos[2]})"
-        self._draw_text(pos_text, 20, 50, (200, 200, 200))
+        self._draw_text(pos_label, 20, 50, (200, 200, 200))
         
         # Current color (with swatch)
-        self._draw_text("Color:", 20, 80, (200, 200, 200))
+        self._draw_text(self._color_label, 20, 80, (200, 200, 200))
         self._draw_color_swatch(80, 80, 30, 20, current_color)
         
         # Voxel count
-        count_text = f"Voxels: {voxel_count}"
-        self._draw_text(count_text, 20, 110, (200, 200, 200))
+        self._draw_text(count_label, 20, 110, (200, 200, 200))
         
         # Controls hint at bottom
         self._draw_panel(10, self.height - 50, 400, 40, (20, 20, 30, 150))
-        controls = "Q: Quit | Z: Undo | C: Change Color | R: Reset View"
-        self._draw_text(controls, 20, self.height - 40, (150, 150, 150), small=True)
+        self._draw_text(self._controls_label, 20, self.height - 40,
+                        self.CONTROLS_COLOR)
         
         # Restore 3D rendering
         self._end_2d()
@@ -105,14 +211,12 @@ class HUD:
         glLoadIdentity()
         
         glDisable(GL_DEPTH_TEST)
-        glDisable(GL_LIGHTING)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
     
     def _end_2d(self):
         """Restore 3D projection."""
         glDisable(GL_BLEND)
-        glEnable(GL_LIGHTING)
         glEnable(GL_DEPTH_TEST)
         
         glMatrixMode(GL_PROJECTION)
@@ -152,36 +256,50 @@ class HUD:
         glVertex2f(x, y + height)
         glEnd()
     
-    def _draw_text(self, text: str, x: int, y: int, color: Tuple[int, int, int], 
-                   small: bool = False):
-        """Draw text using pygame surface converted to OpenGL texture."""
-        font = self.small_font if small else self.font
+    def _upload_atlas(self, font: pygame.font.Font) -> Tuple[int, Dict[str, Glyph]]:
+        """Rasterize a font's glyph atlas and upload it as a texture."""
+        atlas, glyphs = build_glyph_atlas(font)
+        width, height = atlas.get_size()
         
-        # Render text to pygame surface
-        text_surface = font.render(text, True, color)
-        text_data = pygame.image.tostring(text_surface, "RGBA", True)
-        
-        # Draw as OpenGL texture
-        width, height = text_surface.get_size()
-        
-        # Create texture
         texture_id = glGenTextures(1)
         glBindTexture(GL_TEXTURE_2D, texture_id)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                     pygame.image.tostring(atlas, "RGBA"))
+        
+        return texture_id, glyphs
+    
+    def _layout(self, text: str, small: bool = False) -> TextLayout:
+        """Lay out text at the origin against the font's atlas.
         
-        # Enable texturing
+        Layouts are position-independent (_draw_text translates them), so
+        they can be kept for as long as the text itself does not change.
+        """
+        texture_id, glyphs = self._atlases[small]
+        positions, texcoords = layout_text(text, glyphs, 0, 0)
+        return texture_id, positions, texcoords
+    
+    def _draw_text(self, layout: TextLayout, x: int, y: int,
+                   color: Tuple[int, int, int]):
+        """Draw a text layout as one quad per glyph from its font's atlas."""
+        texture_id, positions, texcoords = layout
+        
+        glPushMatrix()
+        glTranslatef(x, y, 0)
+        
+        # Atlas glyphs are white; the vertex color tints them
         glEnable(GL_TEXTURE_2D)
-        glColor4f(1, 1, 1, 1)
+        glBindTexture(GL_TEXTURE_2D, texture_id)
+        glColor4f(color[0]/255, color[1]/255, color[2]/255, 1)
         
-        # Draw textured quad (flipped because of coordinate system)
-        glBegin(GL_QUADS)
-        glTexCoord2f(0, 1); glVertex2f(x, y)
-        glTexCoord2f(1, 1); glVertex2f(x + width, y)
-        glTexCoord2f(1, 0); glVertex2f(x + width, y + height)
-        glTexCoord2f(0, 0); glVertex2f(x, y + height)
-        glEnd()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+        glVertexPointer(2, GL_FLOAT, 0, positions)
+        glTexCoordPointer(2, GL_FLOAT, 0, texcoords)
+        glDrawArrays(GL_QUADS, 0, len(positions))
+        glDisableClientState(GL_TEXTURE_COORD_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
         
         glDisable(GL_TEXTURE_2D)
-        glDeleteTextures([texture_id])
+        glPopMatrix()
@@ -1,15 +1,124 @@
 """3D Voxel grid data structure and operations."""
 import numpy as np
-from typing import Dict, Tuple, List, Optional
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Iterator, NamedTuple, Tuple, List, Optional
 from dataclasses import dataclass
 
+from .jit import njit, NUMBA_AVAILABLE
 
-@dataclass
-class Voxel:
-    """Represents a single voxel."""
+
+def _greedy_rectangles(mask: np.ndarray) -> List[Tuple[int, int, int, int, int]]:
+    """Merge equal nonzero labels of a 2D mask into maximal rectangles.
+    
+    Scans row-major, grows each rectangle along the row first and then
+    down while whole rows match. The mask is consumed (zeroed) in place.
+    
+    Returns:
+        List of (row, col, height, width, label) tuples
+    """
+    rows, cols = mask.shape
+    rects = []
+    for i, j in zip(*np.nonzero(mask)):
+        label = mask[i, j]
+        if label == 0:
+            continue  # Already merged into an earlier rectangle
+        w = 1
+        while j + w < cols and mask[i, j + w] == label:
+            w += 1
+        h = 1
+        while i + h < rows and (mask[i + h, j:j + w] == label).all():
+            h += 1
+        mask[i:i + h, j:j + w] = 0
+        rects.append((int(i), int(j), h, w, int(label)))
+    return rects
+
+
+# Sparse face index slot marker for a removed voxel (above the 6 face bits)
+_TOMBSTONE = 0x80
+
+# Neighbor offset per face id: right, left, top, bottom, front, back
+_FACE_OFFSETS = ((1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1))
+
+_CULL_HEADER = """\
+def _cull(occupancy, boundary, palette_idx, palette, out_pos, out_face, out_color):
+    n = 0
+    for x in range({g}):
+        for y in range({g}):
+            for z in range({g}):
+                if not occupancy[x, y, z]:
+                    continue
+                color = palette[palette_idx[x, y, z]]
+"""
+
+_CULL_FACE = """\
+                if (not occupancy[{neighbor}]) if {inside} else (not boundary[{face_id}]):
+                    out_pos[n, 0] = x
+                    out_pos[n, 1] = y
+                    out_pos[n, 2] = z
+                    out_face[n] = {face_id}
+                    out_color[n, 0] = color[0]
+                    out_color[n, 1] = color[1]
+                    out_color[n, 2] = color[2]
+                    n += 1
+"""
+
+
+@lru_cache(maxsize=None)
+def _build_cull_kernel(grid_size: int):
+    """Generate a cull kernel with grid_size baked in as a literal.
+    
+    The kernel makes one pass over the grid with all 6 neighbor checks
+    unrolled, writing every exposed face into preallocated output buffers
+    and returning the face count. boundary[face_id] marks grid sides whose
+    outside counts as solid. Literal loop bounds and edge tests let LLVM
+    unroll and vectorize the inner loop; exec'd source has no file, so
+    the compiled kernel is not cached to disk.
+    
+    Args:
+        grid_size: Edge length of the grid the kernel will cull
+        
+    Returns:
+        Callable kernel (Numba-compiled when available)
+    """
+    last = grid_size - 1
+    lines = [_CULL_HEADER.format(g=grid_size)]
+    for face_id, offset in enumerate(_FACE_OFFSETS):
+        axis = next(a for a in range(3) if offset[a])
+        var = "xyz"[axis]
+        inside = f"{var} < {last}" if offset[axis] > 0 else f"{var} > 0"
+        neighbor = ", ".join(
+            f"{v} {'+' if d > 0 else '-'} 1" if d else v for v, d in zip("xyz", offset))
+        lines.append(_CULL_FACE.format(neighbor=neighbor, inside=inside, face_id=face_id))
+    lines.append("    return n\n")
+    
+    namespace = {}
+    exec("".join(lines), namespace)
+    return njit(boundscheck=False)(namespace["_cull"])
+
+
+class Voxel(NamedTuple):
+    """Represents a single voxel (built only on get_voxel lookups)."""
     color: Tuple[int, int, int]  # RGB color
 
 
+# Face names, indexed by VisibleFaces.face_ids
+FACE_NAMES = ("right", "left", "top", "bottom", "front", "back")
+_BOTTOM = FACE_NAMES.index("bottom")
+
+
+@dataclass
+class VisibleFaces:
+    """Visible voxel faces as parallel arrays (struct-of-arrays)."""
+    positions: np.ndarray  # (N, 3) int16 voxel coordinates
+    face_ids: np.ndarray   # (N,) uint8 index into FACE_NAMES
+    colors: np.ndarray     # (N, 3) uint8 RGB
+    
+    def __len__(self) -> int:
+        return len(self.face_ids)
+
+
 class VoxelEngine:
     """Manages a 3D voxel grid."""
     
@@ -25,43 +134,162 @@ class VoxelEngine:
         (100, 100, 100),  # Gray
     ]
     
-    def __init__(self, grid_size: int = 16):
+    # Neighbor offset per face id, as an array for vectorized code
+    _DIR = np.array(_FACE_OFFSETS, dtype=np.int8)
+    
+    # Per-voxel colors are uint8 indices, so the palette holds at most 256
+    MAX_PALETTE = 256
+    
+    def __init__(self, grid_size: int = 16, use_numba: bool = True):
         """Initialize voxel engine.
         
         Args:
             grid_size: Size of the cubic grid (e.g., 16 = 16x16x16)
+            use_numba: Cull with the compiled kernel (falls back to the
+                incrementally patched NumPy face mask when Numba is not
+                installed)
         """
         self.grid_size = grid_size
-        self.voxels: Dict[Tuple[int, int, int], Voxel] = {}
+        self.use_numba = use_numba and NUMBA_AVAILABLE
+        
+        # Dense storage: occupancy flags and a palette index per cell. The
+        # palette starts as COLORS (which includes the floor gray) so that
+        # current_color_index is also a palette index
+        self.occupancy = np.zeros((grid_size, grid_size, grid_size), dtype=bool)
+        self.palette_idx = np.zeros((grid_size, grid_size, grid_size), dtype=np.uint8)
+        self.palette = np.array(self.COLORS, dtype=np.uint8)
+        self._palette_lookup = {color: i for i, color in enumerate(self.COLORS)}
+        
+        # Sparse face index (NumPy path only; the Numba kernel culls straight
+        # from occupancy): one slot per placed voxel holding its position and
+        # a bitmask of face ids whose neighbor is solid, patched around each
+        # edit. Memory and extraction cost scale with the voxel count, not
+        # G^3. Removed voxels leave tombstones until the next compaction
+        self._slot_pos = array('i')    # x, y, z per slot
+        self._slot_solid = array('B')  # solid-neighbor bits per slot
+        self._slot_of = {}             # packed position key -> slot
+        self._tombstones = 0
+        
+        # Per face id: whether the outside of that grid side counts as solid.
+        # Set for the bottom side by create_floor(y=0) and dropped as soon as
+        # a bottom-layer cell is emptied, so it only holds while the floor is
+        # complete. Its underside is then skipped; it only shows when the
+        # camera pitches below the grid
+        self._boundary_occluding = np.zeros(6, dtype=bool)
+        
         self.current_color_index = 0
-        self.undo_stack: List[Tuple[str, Tuple[int, int, int], Optional[Voxel]]] = []
+        self._current_color = self.COLORS[0]  # Kept in sync by next/prev_color
+        # Positions in the sparse index and undo entries are packed into one
+        # int key (x | y << shift | z << 2 * shift): cheap to hash and store
+        self._key_shift = max(1, (grid_size - 1).bit_length())
+        
+        # (action, packed pos, previous occupancy, previous palette index); the
+        # oldest entry is evicted automatically past max_undo
         self.max_undo = 50
-        self._visible_faces_cache: Optional[List[dict]] = None
+        self.undo_stack: Deque[Tuple[str, int, bool, int]] = deque(
+            maxlen=self.max_undo)
+        self._visible_faces_cache: Optional[VisibleFaces] = None
+        self._greedy_mesh_cache: Optional[List[dict]] = None
+        self.revision = 0  # Bumped on every change; lets renderers cache meshes
+        
+        # Cull kernel specialized for this grid size (Numba path only)
+        self._cull = _build_cull_kernel(grid_size) if self.use_numba else None
         
         print(f"[OK] Voxel engine initialized ({grid_size}^3 grid)")
     
+    def warmup(self):
+        """Compile the Numba cull kernel ahead of the first edit."""
+        if not self.use_numba:
+            return
+        # The kernel's loop bounds are baked in, so it needs full-size input;
+        # an empty grid writes nothing to the zero-length outputs
+        occupancy = np.zeros_like(self.occupancy)
+        out_pos = np.empty((0, 3), dtype=np.int16)
+        out_face = np.empty(0, dtype=np.uint8)
+        out_color = np.empty((0, 3), dtype=np.uint8)
+        self._cull(occupancy, self._boundary_occluding, self.palette_idx, self.palette,
+                   out_pos, out_face, out_color)
+    
     @property
     def current_color(self) -> Tuple[int, int, int]:
         """Get current selected color."""
-        return self.COLORS[self.current_color_index]
+        return self._current_color
     
     def next_color(self):
         """Cycle to next color in palette."""
         self.current_color_index = (self.current_color_index + 1) % len(self.COLORS)
+        self._current_color = self.COLORS[self.current_color_index]
     
     def prev_color(self):
         """Cycle to previous color in palette."""
         self.current_color_index = (self.current_color_index - 1) % len(self.COLORS)
+        self._current_color = self.COLORS[self.current_color_index]
     
     def is_valid_position(self, x: int, y: int, z: int) -> bool:
         """Check if position is within grid bounds."""
         return 0 <= x < self.grid_size and 0 <= y < self.grid_size and 0 <= z < self.grid_size
     
+    def _intern_color(self, color: Tuple[int, int, int]) -> int:
+        """Get the palette index for a color, adding it if unseen.
+        
+        When the palette is full, entries no longer used by any voxel or
+        undo entry are dropped first; if every entry is still in use the
+        nearest existing color is returned instead, with a warning.
+        
+        Args:
+            color: RGB color tuple
+            
+        Returns:
+            int: Index into self.palette
+        """
+        key = tuple(int(c) for c in color)
+        index = self._palette_lookup.get(key)
+        if index is not None:
+            return index
+        
+        if len(self.palette) >= self.MAX_PALETTE:
+            self._compact_palette()
+        if len(self.palette) >= self.MAX_PALETTE:
+            distances = ((self.palette.astype(np.int32) - key) ** 2).sum(axis=1)
+            index = int(distances.argmin())
+            nearest = tuple(self.palette[index].tolist())
+            print(f"[WARN] Palette full ({self.MAX_PALETTE} colors in use): "
+                  f"{key} replaced by nearest color {nearest}")
+            return index
+        
+        index = len(self.palette)
+        self.palette = np.vstack([self.palette, np.array(key, dtype=np.uint8)])
+        self._palette_lookup[key] = index
+        return index
+    
+    def _compact_palette(self):
+        """Drop palette entries not referenced by the grid or undo stack.
+        
+        The COLORS entries are always kept so their indices stay stable.
+        """
+        used = set(range(len(self.COLORS)))
+        used.update(np.unique(self.palette_idx[self.occupancy]).tolist())
+        used.update(entry[3] for entry in self.undo_stack)
+        keep = sorted(used)
+        
+        remap = np.zeros(self.MAX_PALETTE, dtype=np.uint8)
+        remap[keep] = np.arange(len(keep))
+        self.palette_idx = remap[self.palette_idx]
+        self.undo_stack = deque(((action, key, occupied, int(remap[index]))
+                                 for action, key, occupied, index in self.undo_stack),
+                                maxlen=self.max_undo)
+        
+        self.palette = self.palette[keep]
+        self._palette_lookup = {tuple(c): i for i, c in enumerate(self.palette.tolist())}
+    
     def _invalidate_cache(self):
-        """Invalidate the visible faces cache."""
+        """Invalidate the extracted visible faces and greedy mesh caches."""
         self._visible_faces_cache = None
+        self._greedy_mesh_cache = None
+        self.revision += 1
 
-    def place_voxel(self, x: int, y: int, z: int, color: Tuple[int, int, int] = None) -> bool:
+    def place_voxel(self, x: int, y: int, z: int,
+                    color: Optional[Tuple[int, int, int]] = None) -> bool:
         """Place a voxel at position.
         
         Args:
@@ -75,13 +303,18 @@ class VoxelEngine:
             return False
         
         pos = (x, y, z)
-        color = color or self.current_color
+        
+        # COLORS entries are pinned at their palette index, so the current
+        # color needs no lookup; an explicit color (even black) is interned
+        if color is None:
+            index = self.current_color_index
+        else:
+            index = self._intern_color(color)
         
         # Save for undo
-        old_voxel = self.voxels.get(pos)
-        self._push_undo("place", pos, old_voxel)
+        self._push_undo("place", pos)
         
-        self.voxels[pos] = Voxel(color=color)
+        self._set_cell(pos, True, index)
         self._invalidate_cache()
         return True
     
@@ -94,31 +327,54 @@ class VoxelEngine:
         Returns:
             bool: True if removed successfully
         """
-        pos = (x, y, z)
-        if pos not in self.voxels:
+        if not self.has_voxel(x, y, z):
             return False
         
+        pos = (x, y, z)
+        
         # Save for undo
-        old_voxel = self.voxels[pos]
-        self._push_undo("remove", pos, old_voxel)
+        self._push_undo("remove", pos)
         
-        del self.voxels[pos]
+        self._set_cell(pos, False)
         self._invalidate_cache()
         return True
     
+    @property
+    def voxel_count(self) -> int:
+        """Number of placed voxels."""
+        return int(np.count_nonzero(self.occupancy))
+    
     def get_voxel(self, x: int, y: int, z: int) -> Optional[Voxel]:
         """Get voxel at position."""
-        return self.voxels.get((x, y, z))
+        if not self.has_voxel(x, y, z):
+            return None
+        return Voxel(color=tuple(self.palette[self.palette_idx[x, y, z]].tolist()))
     
     def has_voxel(self, x: int, y: int, z: int) -> bool:
         """Check if voxel exists at position."""
-        return (x, y, z) in self.voxels
+        return self.is_valid_position(x, y, z) and bool(self.occupancy[x, y, z])
+    
+    def _pack(self, x: int, y: int, z: int) -> int:
+        """Pack an in-grid position into one int key."""
+        shift = self._key_shift
+        return x | y << shift | z << 2 * shift
+    
+    def _pack_batch(self, positions: np.ndarray) -> np.ndarray:
+        """Pack (N, 3) in-grid positions into (N,) int64 keys."""
+        positions = positions.astype(np.int64)
+        shift = self._key_shift
+        return positions[:, 0] | positions[:, 1] << shift | positions[:, 2] << 2 * shift
+    
+    def _unpack(self, key: int) -> Tuple[int, int, int]:
+        """Unpack an int key back into a position."""
+        shift = self._key_shift
+        mask = (1 << shift) - 1
+        return (key & mask, key >> shift & mask, key >> 2 * shift)
     
-    def _push_undo(self, action: str, pos: Tuple[int, int, int], voxel: Optional[Voxel]):
-        """Push action to undo stack."""
-        self.undo_stack.append((action, pos, voxel))
-        if len(self.undo_stack) > self.max_undo:
-            self.undo_stack.pop(0)
+    def _push_undo(self, action: str, pos: Tuple[int, int, int]):
+        """Push action to undo stack, with the cell's state before it."""
+        prev_index = int(self.palette_idx[pos])
+        self.undo_stack.append((action, self._pack(*pos), bool(self.occupancy[pos]), prev_index))
     
     def undo(self) -> bool:
         """Undo last action.
@@ -129,77 +385,351 @@ class VoxelEngine:
         if not self.undo_stack:
             return False
         
-        action, pos, voxel = self.undo_stack.pop()
-        
-        if action == "place":
-            if voxel is None:
-                # Was empty before, remove it
-                if pos in self.voxels:
-                    del self.voxels[pos]
-            else:
-                # Restore old voxel
-                self.voxels[pos] = voxel
-        elif action == "remove":
-            # Restore removed voxel
-            if voxel is not None:
-                self.voxels[pos] = voxel
+        # Both place and remove are undone by restoring the cell's old state
+        _, key, prev_occupied, prev_index = self.undo_stack.pop()
+        self._set_cell(self._unpack(key), prev_occupied, prev_index)
         
         self._invalidate_cache()
         return True
     
-    def get_visible_faces(self) -> List[dict]:
-        """Get list of visible voxel faces (with culling).
+    def _set_cell(self, pos: Tuple[int, int, int], occupied: bool,
+                  index: Optional[int] = None):
+        """Write one cell and patch the sparse face index around it.
+        
+        Only the cell's own 6 faces and the facing faces of its 6
+        neighbors can change.
+        """
+        self.occupancy[pos] = occupied
+        x, y, z = pos
+        if index is not None:
+            self.palette_idx[pos] = index
+        if not occupied and y == 0 and self._boundary_occluding[_BOTTOM]:
+            # A hole in the floor: the underside no longer counts as solid
+            self._boundary_occluding[_BOTTOM] = False
+            self._rebuild_exposed()
+            return
+        if self.use_numba:
+            return
+        
+        slots = self._slot_of
+        solid_bits = self._slot_solid
+        shift = self._key_shift
+        key = x | y << shift | z << 2 * shift
+        slot = slots.get(key)
+        if occupied and slot is None:
+            slot = len(solid_bits)
+            slots[key] = slot
+            self._slot_pos.extend(pos)
+            solid_bits.append(0)
+        elif not occupied and slot is not None:
+            del slots[key]
+            solid_bits[slot] = _TOMBSTONE
+            self._tombstones += 1
+            slot = None
         
+        # Opposite faces are adjacent ids (right/left, top/bottom, front/back)
+        solid = 0
+        g = self.grid_size
+        for face_id, (dx, dy, dz) in enumerate(_FACE_OFFSETS):
+            nx, ny, nz = x + dx, y + dy, z + dz
+            if not (0 <= nx < g and 0 <= ny < g and 0 <= nz < g):
+                if self._boundary_occluding[face_id]:
+                    solid |= 1 << face_id
+                continue
+            neighbor = slots.get(nx | ny << shift | nz << 2 * shift)
+            if neighbor is not None:
+                solid |= 1 << face_id
+                if occupied:
+                    solid_bits[neighbor] |= 1 << (face_id ^ 1)
+                else:
+                    solid_bits[neighbor] &= ~(1 << (face_id ^ 1))
+        if slot is not None:
+            solid_bits[slot] = solid
+        
+        if self._tombstones > max(64, len(slots)):
+            self._compact_slots()
+    
+    def _compact_slots(self):
+        """Drop tombstoned slots from the sparse face index."""
+        solid = np.frombuffer(self._slot_solid, dtype=np.uint8)
+        keep = np.flatnonzero(solid != _TOMBSTONE)
+        positions = np.frombuffer(self._slot_pos, dtype=np.intc).reshape(-1, 3)[keep]
+        self._load_slots(positions, solid[keep])
+    
+    def _load_slots(self, positions: np.ndarray, solid: np.ndarray):
+        """Replace the sparse face index with the given slots.
+        
+        Args:
+            positions: (N, 3) voxel positions
+            solid: (N,) uint8 solid-neighbor bits
+        """
+        self._slot_pos = array('i', positions.astype(np.intc).tobytes())
+        self._slot_solid = array('B', solid.astype(np.uint8).tobytes())
+        keys = self._pack_batch(positions)
+        self._slot_of = dict(zip(keys.tolist(), range(len(positions))))
+        self._tombstones = 0
+    
+    def _rebuild_exposed(self):
+        """Recompute visibility for the whole grid (after bulk edits)."""
+        if self.use_numba:
+            return  # The kernel culls straight from occupancy
+        g = self.grid_size
+        if g > 64:
+            self._index_gathered()
+            return
+        
+        # Pack the bool grid into uint64 rows (bit x of rows[y, z] is cell
+        # (x, y, z)), then cull each row against its +/-x bit neighbors and
+        # the rows at +/-y and +/-z as whole-row integer ops
+        bits = np.uint64(1) << np.arange(g, dtype=np.uint64)
+        rows = np.moveaxis(self.occupancy, 0, -1).astype(np.uint64) @ bits
+        
+        one = np.uint64(1)
+        neighbors = np.zeros((6, g, g), dtype=np.uint64)
+        neighbors[0] = rows >> one     # right: bit x+1
+        neighbors[1] = rows << one     # left: bit x-1
+        neighbors[2, :-1] = rows[1:]   # top: row y+1
+        neighbors[3, 1:] = rows[:-1]   # bottom: row y-1
+        neighbors[4, :, :-1] = rows[:, 1:]  # front: row z+1
+        neighbors[5, :, 1:] = rows[:, :-1]  # back: row z-1
+        
+        # Occluding grid sides: the bits/rows past the edge count as set
+        full = np.uint64((1 << g) - 1)
+        occluding = self._boundary_occluding
+        if occluding[0]:
+            neighbors[0] |= one << np.uint64(g - 1)
+        if occluding[1]:
+            neighbors[1] |= one
+        if occluding[2]:
+            neighbors[2, -1] = full
+        if occluding[3]:
+            neighbors[3, 0] = full
+        if occluding[4]:
+            neighbors[4, :, -1] = full
+        if occluding[5]:
+            neighbors[5, :, 0] = full
+        masks = rows & ~neighbors
+        
+        # Expand the (6, y, z) row masks back to per-cell bits [face, x, y, z]
+        cells = masks.astype('<u8').view(np.uint8).reshape(6, g, g, 8)
+        cells = np.unpackbits(cells, axis=-1, bitorder='little')[..., :g]
+        self._index_exposed(np.moveaxis(cells, -1, 1))
+    
+    def _index_exposed(self, exposed: np.ndarray):
+        """Rebuild the sparse face index from a full visible-face mask.
+        
+        Args:
+            exposed: (6, G, G, G) mask indexed [face_id, x, y, z]
+        """
+        xs, ys, zs = np.nonzero(self.occupancy)
+        solid = np.zeros(len(xs), dtype=np.uint8)
+        for face_id in range(6):
+            solid |= (exposed[face_id, xs, ys, zs] == 0).astype(np.uint8) << face_id
+        self._load_slots(np.stack([xs, ys, zs], axis=1), solid)
+    
+    def _index_gathered(self):
+        """Rebuild the sparse face index by gathering each voxel's neighbors.
+        
+        Costs O(voxels * 6) rather than O(G^3), for grids too wide to pack
+        into uint64 rows.
+        """
+        g = self.grid_size
+        positions = np.argwhere(self.occupancy)
+        neighbors = positions[:, None, :] + self._DIR  # (N, 6, 3)
+        inside = ((neighbors >= 0) & (neighbors < g)).all(axis=2)
+        np.clip(neighbors, 0, g - 1, out=neighbors)
+        occupied = self.occupancy[neighbors[..., 0], neighbors[..., 1], neighbors[..., 2]]
+        
+        # Off-grid neighbors are solid only on occluding sides
+        solid = np.where(inside, occupied, self._boundary_occluding)
+        self._load_slots(positions, np.packbits(solid, axis=1, bitorder='little')[:, 0])
+    
+    @property
+    def max_visible_faces(self) -> int:
+        """Upper bound on visible faces for any grid state.
+        
+        Every face lies on one of the (G + 1) planes per axis, G^2 slots
+        each, and a slot holds at most one visible face. Size reusable
+        fill_visible_faces() buffers with this.
+        """
+        g = self.grid_size
+        return 3 * g * g * (g + 1)
+    
+    def fill_visible_faces(self, out_pos: np.ndarray, out_color: np.ndarray,
+                           out_face: np.ndarray) -> int:
+        """Write visible voxel faces (with culling) into caller-owned buffers.
+        
+        Args:
+            out_pos: (M, 3) int16 buffer for voxel positions
+            out_color: (M, 3) uint8 buffer for RGB colors
+            out_face: (M,) uint8 buffer for face ids (index into FACE_NAMES)
+            
         Returns:
-            List of dicts with 'pos', 'face', 'color' keys
+            int: Number of faces written (rows [:n] of each buffer)
+        """
+        needed = min(self.voxel_count * 6, self.max_visible_faces)
+        if min(len(out_pos), len(out_color), len(out_face)) < needed:
+            raise ValueError(f"Face buffers hold fewer than {needed} faces")
+        
+        cached = self._visible_faces_cache
+        if cached is not None:
+            n = len(cached)
+            out_pos[:n] = cached.positions
+            out_color[:n] = cached.colors
+            out_face[:n] = cached.face_ids
+            return n
+        
+        if self.use_numba:
+            return self._cull(self.occupancy, self._boundary_occluding, self.palette_idx,
+                              self.palette, out_pos, out_face, out_color)
+        
+        # The sparse index is always current: per face id, emit the live
+        # slots whose neighbor across that face is not solid
+        solid = np.frombuffer(self._slot_solid, dtype=np.uint8)
+        positions = np.frombuffer(self._slot_pos, dtype=np.intc).reshape(-1, 3)
+        n = 0
+        for face_id in range(6):
+            pos = positions[(solid & (_TOMBSTONE | 1 << face_id)) == 0]
+            k = len(pos)
+            out_pos[n:n + k] = pos
+            out_color[n:n + k] = self.palette[self.palette_idx[pos[:, 0], pos[:, 1], pos[:, 2]]]
+            out_face[n:n + k] = face_id
+            n += k
+        return n
+    
+    def get_visible_faces(self) -> VisibleFaces:
+        """Get visible voxel faces (with culling).
+        
+        Returns:
+            VisibleFaces: positions, face ids and colors of every exposed face
         """
         if self._visible_faces_cache is not None:
             return self._visible_faces_cache
-
-        faces = []
-        directions = [
-            ((1, 0, 0), "right"),
-            ((-1, 0, 0), "left"),
-            ((0, 1, 0), "top"),
-            ((0, -1, 0), "bottom"),
-            ((0, 0, 1), "front"),
-            ((0, 0, -1), "back"),
-        ]
-        
-        for pos, voxel in self.voxels.items():
-            x, y, z = pos
-            for (dx, dy, dz), face in directions:
-                # Check if adjacent voxel exists (face is hidden)
-                if not self.has_voxel(x + dx, y + dy, z + dz):
-                    faces.append({
-                        "pos": pos,
-                        "face": face,
-                        "color": voxel.color,
-                    })
         
+        capacity = min(self.voxel_count * 6, self.max_visible_faces)
+        positions = np.empty((capacity, 3), dtype=np.int16)
+        colors = np.empty((capacity, 3), dtype=np.uint8)
+        face_ids = np.empty(capacity, dtype=np.uint8)
+        n = self.fill_visible_faces(positions, colors, face_ids)
+        
+        faces = VisibleFaces(positions[:n], face_ids[:n], colors[:n])
         self._visible_faces_cache = faces
         return faces
     
+    def iter_visible_faces(self) -> Iterator[Tuple[Tuple[int, int, int], str, Tuple[int, int, int]]]:
+        """Iterate visible faces as (position, face name, color) tuples.
+        
+        A convenience wrapper, not a streaming API: the full VisibleFaces
+        arrays are built (or taken from the cache) and converted to Python
+        lists before the first tuple is yielded. Use fill_visible_faces()
+        to avoid per-call allocation.
+        """
+        faces = self.get_visible_faces()
+        for pos, face_id, color in zip(faces.positions.tolist(), faces.face_ids.tolist(),
+                                       faces.colors.tolist()):
+            yield tuple(pos), FACE_NAMES[face_id], tuple(color)
+    
+    def get_greedy_mesh(self) -> List[dict]:
+        """Get visible faces merged into maximal same-color rectangles.
+        
+        For each face direction and slice along its normal, exposed faces
+        of the same color are merged greedily, so a flat 16x16 floor is one
+        quad per side instead of 256.
+        
+        Returns:
+            List of dicts with 'pos', 'face', 'color', 'size' keys, where
+            'pos' is the min-corner voxel and 'size' the (x, y, z) extent
+            in voxels (1 along the face normal)
+        """
+        if self._greedy_mesh_cache is not None:
+            return self._greedy_mesh_cache
+        
+        # Label grid with a one-voxel empty border so neighbor lookups never
+        # go out of range. 0 = empty, otherwise 1 + palette index
+        labels = np.where(self.occupancy, self.palette_idx.astype(np.int32) + 1, 0)
+        labels = np.pad(labels, 1)
+        occupied = labels > 0
+        
+        # Border cells on occluding sides are solid (they carry no label,
+        # so they never emit faces themselves)
+        occluding = self._boundary_occluding
+        occupied[-1] |= occluding[0]
+        occupied[0] |= occluding[1]
+        occupied[:, -1] |= occluding[2]
+        occupied[:, 0] |= occluding[3]
+        occupied[:, :, -1] |= occluding[4]
+        occupied[:, :, 0] |= occluding[5]
+        colors = [tuple(c) for c in self.palette.tolist()]
+        
+        quads = []
+        for axis in range(3):
+            u_axis, v_axis = [a for a in range(3) if a != axis]
+            
+            # One XOR per neighbor pair along the axis: where exactly one
+            # cell of the pair is occupied, its face across the pair is
+            # exposed (+face of the lower cell, -face of the upper one)
+            lo = [slice(None)] * 3
+            hi = [slice(None)] * 3
+            lo[axis], hi[axis] = slice(None, -1), slice(1, None)
+            lo, hi = tuple(lo), tuple(hi)
+            diff = occupied[lo] ^ occupied[hi]
+            
+            for face_id, side in ((2 * axis, lo), (2 * axis + 1, hi)):
+                face = FACE_NAMES[face_id]
+                exposed = np.zeros_like(labels)
+                exposed[side] = np.where(diff & occupied[side], labels[side], 0)
+                slices = np.moveaxis(exposed, (axis, u_axis, v_axis), (0, 1, 2))
+                
+                for k in np.flatnonzero(slices.any(axis=(1, 2))):
+                    for i, j, h, w, label in _greedy_rectangles(slices[k].copy()):
+                        pos = [0, 0, 0]
+                        pos[axis], pos[u_axis], pos[v_axis] = int(k), i, j
+                        size = [1, 1, 1]
+                        size[u_axis], size[v_axis] = h, w
+                        quads.append({
+                            "pos": (pos[0] - 1, pos[1] - 1, pos[2] - 1),
+                            "face": face,
+                            "color": colors[label - 1],
+                            "size": tuple(size),
+                        })
+        
+        self._greedy_mesh_cache = quads
+        return quads
+    
     def get_all_voxels(self) -> List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]:
         """Get all voxels as (position, color) tuples."""
-        return [(pos, voxel.color) for pos, voxel in self.voxels.items()]
+        positions = np.argwhere(self.occupancy)
+        colors = self.palette[self.palette_idx[self.occupancy]]
+        return [(tuple(p), tuple(c)) for p, c in zip(positions.tolist(), colors.tolist())]
     
     def clear(self):
         """Remove all voxels."""
-        self.voxels.clear()
+        self.occupancy[:] = False
+        self.palette_idx[:] = 0
+        self._load_slots(np.empty((0, 3), dtype=np.intc), np.empty(0, dtype=np.uint8))
+        self._boundary_occluding[:] = False
         self.undo_stack.clear()
         self._invalidate_cache()
     
     def create_floor(self, y: int = 0, color: Tuple[int, int, int] = (100, 100, 100)):
         """Create a floor layer of voxels for reference.
         
+        A floor on the bottom layer also makes the grid's underside
+        occluding, so its bottom faces are culled until a bottom-layer
+        cell is removed again.
+        
         Args:
             y: Y-level for floor
             color: Floor color
         """
-        for x in range(self.grid_size):
-            for z in range(self.grid_size):
-                self.voxels[(x, y, z)] = Voxel(color=color)
+        if not 0 <= y < self.grid_size:
+            return
+        index = self._intern_color(color)
+        if y == 0:
+            self._boundary_occluding[_BOTTOM] = True
+        self.occupancy[:, y, :] = True
+        self.palette_idx[:, y, :] = index
+        self._rebuild_exposed()
         self._invalidate_cache()
     
     def world_to_grid(self, world_pos: Tuple[float, float, float]) -> Tuple[int, int, int]:
@@ -211,13 +741,17 @@ class VoxelEngine:
         Returns:
             Grid coordinates (clamped to valid range)
         """
-        x = int(round(world_pos[0]))
-        y = int(round(world_pos[1]))
-        z = int(round(world_pos[2]))
-        
-        # Clamp to grid bounds
-        x = max(0, min(self.grid_size - 1, x))
-        y = max(0, min(self.grid_size - 1, y))
-        z = max(0, min(self.grid_size - 1, z))
+        return tuple(self.world_to_grid_batch(np.asarray([world_pos]))[0].tolist())
+    
+    def world_to_grid_batch(self, points: np.ndarray) -> np.ndarray:
+        """Convert many world positions to grid coordinates at once.
         
-        return (x, y, z)
\ No newline at end of file
+        Args:
+            points: (N, 3) world space positions
+            
+        Returns:
+            np.ndarray: (N, 3) int32 grid coordinates (clamped to valid range)
+        """
+        idx = np.rint(points).astype(np.int32)
+        np.clip(idx, 0, self.grid_size - 1, out=idx)
+        return idx
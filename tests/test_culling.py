@@ -5,7 +5,43 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.voxel_engine import VoxelEngine
+import io
+import random
+from contextlib import redirect_stdout
+
+import numpy as np
+import pytest
+
+from src.jit import NUMBA_AVAILABLE
+from src.voxel_engine import VoxelEngine, FACE_NAMES
+
+# Neighbor offset per face id, in FACE_NAMES order
+OFFSETS = [(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)]
+
+
+def brute_force_faces(engine):
+    """Visible (position, face_id) pairs from a plain 6-neighbor check."""
+    g = engine.grid_size
+    faces = set()
+    for pos, _ in engine.get_all_voxels():
+        for face_id, (dx, dy, dz) in enumerate(OFFSETS):
+            n = (pos[0] + dx, pos[1] + dy, pos[2] + dz)
+            if engine.is_valid_position(*n):
+                solid = engine.has_voxel(*n)
+            else:
+                solid = engine._boundary_occluding[face_id]
+            if not solid:
+                faces.add((pos, face_id))
+    return faces
+
+
+def face_set(faces):
+    return set(zip(map(tuple, faces.positions.tolist()), faces.face_ids.tolist()))
+
+
+def colored_face_set(faces):
+    return set(zip(map(tuple, faces.positions.tolist()), faces.face_ids.tolist(),
+                   map(tuple, faces.colors.tolist())))
 
 def test_culling():
     engine = VoxelEngine(grid_size=16)
@@ -37,5 +73,220 @@ def test_culling():
 
     print("\n✅ All culling tests passed!")
 
+def test_greedy_mesh():
+    engine = VoxelEngine(grid_size=16)
+    
+    # A same-colored 3x3x3 cube merges into one quad per side
+    for x in range(3):
+        for y in range(3):
+            for z in range(3):
+                engine.place_voxel(x, y, z, color=(255, 0, 0))
+    quads = engine.get_greedy_mesh()
+    assert len(quads) == 6
+    assert sum(q["size"][0] * q["size"][1] * q["size"][2] for q in quads) == 54
+    
+    # A different color on top splits the merged faces it touches
+    engine.place_voxel(1, 3, 1, color=(0, 0, 255))
+    quads = engine.get_greedy_mesh()
+    area = sum(q["size"][0] * q["size"][1] * q["size"][2] for q in quads)
+    assert area == len(engine.get_visible_faces())
+    assert {q["color"] for q in quads} == {(255, 0, 0), (0, 0, 255)}
+
+def test_floor_underside_culled():
+    engine = VoxelEngine(grid_size=16)
+    engine.create_floor()
+    
+    # Only the floor's top faces and outer rim remain: no bottom faces
+    faces = engine.get_visible_faces()
+    assert len(faces) == 16 * 16 + 4 * 16
+    assert not (faces.face_ids == 3).any()
+    
+    # Clearing the grid drops the floor and its occluding underside
+    engine.clear()
+    engine.place_voxel(5, 0, 5)
+    assert len(engine.get_visible_faces()) == 6
+
+def test_floor_hole_restores_underside():
+    for use_numba in (False, True):
+        engine = VoxelEngine(grid_size=8, use_numba=use_numba)
+        engine.create_floor()
+        
+        # Removing a floor cell opens the underside again for the whole grid
+        engine.remove_voxel(3, 0, 3)
+        assert not engine._boundary_occluding.any()
+        assert face_set(engine.get_visible_faces()) == brute_force_faces(engine)
+        assert (engine.get_visible_faces().face_ids == 3).sum() == 8 * 8 - 1
+        
+        # A voxel placed back in the hole shows its bottom face
+        engine.place_voxel(3, 0, 3)
+        faces = face_set(engine.get_visible_faces())
+        assert ((3, 0, 3), 3) in faces
+        assert faces == brute_force_faces(engine)
+        area = sum(q["size"][0] * q["size"][1] * q["size"][2]
+                   for q in engine.get_greedy_mesh())
+        assert area == len(faces)
+
+def test_place_black_voxel():
+    engine = VoxelEngine(grid_size=16)
+    
+    # Black is a real color, not "use the current color"
+    engine.place_voxel(1, 1, 1, color=(0, 0, 0))
+    engine.place_voxel(2, 1, 1)
+    assert engine.get_voxel(1, 1, 1).color == (0, 0, 0)
+    assert engine.get_voxel(2, 1, 1).color == engine.current_color
+
+def test_sparse_index_compaction():
+    engine = VoxelEngine(grid_size=4, use_numba=False)
+    rng = random.Random(0)
+    
+    # ~1000 removals on a 64-cell grid cross the tombstone threshold many times
+    for step in range(2000):
+        pos = [rng.randrange(4) for _ in range(3)]
+        if rng.random() < 0.5:
+            engine.place_voxel(*pos)
+        else:
+            engine.remove_voxel(*pos)
+        if step % 100 == 0:
+            assert face_set(engine.get_visible_faces()) == brute_force_faces(engine)
+    assert face_set(engine.get_visible_faces()) == brute_force_faces(engine)
+    assert len(engine._slot_of) == engine.voxel_count
+    
+    # Compaction keeps the slot arrays bounded instead of growing per removal
+    assert engine._tombstones <= max(64, engine.voxel_count)
+    assert len(engine._slot_solid) == engine.voxel_count + engine._tombstones
+
+def test_sparse_index_undo_removal():
+    engine = VoxelEngine(grid_size=8, use_numba=False)
+    for x in range(3):
+        engine.place_voxel(x, 1, 1)
+    before = brute_force_faces(engine)
+    
+    engine.remove_voxel(1, 1, 1)
+    assert face_set(engine.get_visible_faces()) == brute_force_faces(engine)
+    engine.undo()
+    assert face_set(engine.get_visible_faces()) == before == brute_force_faces(engine)
+
+def test_sparse_index_clear_then_floor():
+    engine = VoxelEngine(grid_size=8, use_numba=False)
+    for x in range(4):
+        engine.place_voxel(x, 2, x)
+    engine.clear()
+    assert len(engine.get_visible_faces()) == 0
+    
+    engine.create_floor()
+    engine.place_voxel(3, 1, 3)
+    assert face_set(engine.get_visible_faces()) == brute_force_faces(engine)
+
+def test_packed_keys_round_trip():
+    for grid_size in (7, 70):
+        engine = VoxelEngine(grid_size=grid_size, use_numba=False)
+        g = grid_size
+        positions = [(x, y, z) for x in (0, 1, g // 2, g - 1)
+                     for y in (0, g // 3, g - 1) for z in (0, 2, g - 1)]
+        keys = [engine._pack(*pos) for pos in positions]
+        assert len(set(keys)) == len(positions)
+        assert [engine._unpack(key) for key in keys] == positions
+        batch = engine._pack_batch(np.array(positions))
+        assert batch.tolist() == keys
+        
+        # Above 64 the full rebuild gathers neighbors instead of packing rows
+        for pos in positions:
+            engine.place_voxel(*pos)
+        engine.create_floor()
+        engine.undo()
+        assert face_set(engine.get_visible_faces()) == brute_force_faces(engine)
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="Numba not installed")
+def test_generated_kernel_matches_numpy():
+    rng = random.Random(1)
+    for grid_size in (1, 2, 5, 16, 33):
+        kernel = VoxelEngine(grid_size=grid_size)
+        fallback = VoxelEngine(grid_size=grid_size, use_numba=False)
+        
+        # Voxels on every grid edge, where off-by-one bounds would show
+        g = grid_size
+        for _ in range(g * g * 2):
+            pos = [rng.choice((0, g - 1, rng.randrange(g))) for _ in range(3)]
+            color = rng.choice(VoxelEngine.COLORS)
+            for engine in (kernel, fallback):
+                engine.place_voxel(*pos, color=color)
+        assert colored_face_set(kernel.get_visible_faces()) == \
+            colored_face_set(fallback.get_visible_faces())
+        
+        # Occluding floor side
+        for engine in (kernel, fallback):
+            engine.create_floor()
+        assert colored_face_set(kernel.get_visible_faces()) == \
+            colored_face_set(fallback.get_visible_faces())
+
+def test_fill_visible_faces_buffers():
+    for use_numba in (False, True):
+        # A checkerboard exposes every face of every voxel
+        engine = VoxelEngine(grid_size=4, use_numba=use_numba)
+        for x in range(4):
+            for y in range(4):
+                for z in range(4):
+                    if (x + y + z) % 2 == 0:
+                        engine.place_voxel(x, y, z)
+        
+        m = engine.max_visible_faces
+        out_pos = np.empty((m, 3), dtype=np.int16)
+        out_color = np.empty((m, 3), dtype=np.uint8)
+        out_face = np.empty(m, dtype=np.uint8)
+        n = engine.fill_visible_faces(out_pos, out_color, out_face)
+        assert n == 32 * 6 <= m
+        assert set(zip(map(tuple, out_pos[:n].tolist()), out_face[:n].tolist())) == \
+            brute_force_faces(engine)
+        
+        # Undersized buffers are rejected before anything is written
+        with pytest.raises(ValueError):
+            engine.fill_visible_faces(out_pos[:n - 1], out_color, out_face)
+    
+    # A lone voxel in a 1-wide grid reaches the bound exactly
+    engine = VoxelEngine(grid_size=1)
+    engine.place_voxel(0, 0, 0)
+    assert len(engine.get_visible_faces()) == engine.max_visible_faces == 6
+
+
+def test_palette_compaction_and_overflow():
+    engine = VoxelEngine(grid_size=8, use_numba=False)
+    spare = VoxelEngine.MAX_PALETTE - len(VoxelEngine.COLORS)
+    cells = [(x, y, z) for x in range(8) for y in range(8) for z in range(8)]
+    
+    # Fill every free palette slot with a distinct color
+    for i in range(spare):
+        engine.place_voxel(*cells[i], color=(i, 1, 2))
+    assert len(engine.palette) == VoxelEngine.MAX_PALETTE
+    
+    # Once the voxels (and their undo entries) are gone, compaction frees
+    # their slots, so a new color is stored exactly
+    for i in range(spare):
+        engine.remove_voxel(*cells[i])
+    engine.undo_stack.clear()
+    engine.place_voxel(0, 0, 0, color=(9, 8, 7))
+    assert engine.get_voxel(0, 0, 0).color == (9, 8, 7)
+    assert len(engine.palette) == len(VoxelEngine.COLORS) + 1
+    
+    # With every slot in use, a new color falls back to the nearest one
+    # and says so
+    for i in range(spare - 1):
+        engine.place_voxel(*cells[i + 1], color=(i, 1, 2))
+    out = io.StringIO()
+    with redirect_stdout(out):
+        engine.place_voxel(*cells[spare], color=(9, 8, 6))
+    assert engine.get_voxel(*cells[spare]).color == (9, 8, 7)
+    assert "Palette full" in out.getvalue()
+
 if __name__ == "__main__":
     test_culling()
+    test_greedy_mesh()
+    test_floor_underside_culled()
+    test_floor_hole_restores_underside()
+    test_place_black_voxel()
+    test_sparse_index_compaction()
+    test_sparse_index_undo_removal()
+    test_sparse_index_clear_then_floor()
+    test_packed_keys_round_trip()
+    test_generated_kernel_matches_numpy()
+    test_fill_visible_faces_buffers()
+    test_palette_compaction_and_overflow()
@@ -10,6 +10,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src.gesture_detector import GestureDetector, Gesture
 from src.gesture_detector import THUMB_TIP, INDEX_TIP, WRIST, INDEX_MCP, MIDDLE_MCP
+from src.gesture_detector import _hand_scale_sq, _score_gestures
+from src.jit import NUMBA_AVAILABLE
 
 # Mock Landmark class
 class MockLandmark:
@@ -42,9 +44,18 @@ def create_mock_hand(pinch_dist=1.0, scale=0.2):
     
     return landmarks
 
+def random_hand(rng):
+    """Random (21, 3) landmarks, with the thumb near the index tip half the time."""
+    lm = rng.random((21, 3)).astype(np.float32)
+    if rng.random() < 0.5:
+        lm[THUMB_TIP] = lm[INDEX_TIP] + rng.normal(0, 0.05, 3)
+    return lm
+
 class TestGestureDetector(unittest.TestCase):
+    use_numba = False
+    
     def setUp(self):
-        self.detector = GestureDetector()
+        self.detector = GestureDetector(use_numba=self.use_numba)
         
     def test_state_machine_cycle(self):
         print("\n--- Testing State Machine Cycle ---")
@@ -114,5 +125,34 @@ class TestGestureDetector(unittest.TestCase):
         
         print("✅ State Machine Cycle Verified")
 
+@unittest.skipUnless(NUMBA_AVAILABLE, "Numba not installed")
+class TestGestureDetectorNumba(TestGestureDetector):
+    use_numba = True
+
+@unittest.skipUnless(NUMBA_AVAILABLE, "Numba not installed")
+class TestCompiledScoring(unittest.TestCase):
+    def test_scores_match_python(self):
+        detector = GestureDetector(use_numba=False)
+        rng = np.random.default_rng(0)
+        for _ in range(1000):
+            lm = random_hand(rng)
+            scale_sq = detector._get_hand_scale_sq(lm)
+            self.assertAlmostEqual(float(_hand_scale_sq(lm)), scale_sq, places=6)
+            
+            expected = detector._get_gesture_scores(lm, scale_sq)
+            scores = _score_gestures(lm, _hand_scale_sq(lm), detector.curl_threshold)
+            self.assertAlmostEqual(scores[0], expected[0], places=5)
+            self.assertEqual(scores[1:], expected[1:])
+    
+    def test_sequences_match_python(self):
+        rng = np.random.default_rng(1)
+        for _ in range(200):
+            compiled = GestureDetector(use_numba=True)
+            python = GestureDetector(use_numba=False)
+            for _ in range(60):
+                lm = None if rng.random() < 0.05 else random_hand(rng)
+                self.assertEqual(compiled.detect(lm), python.detect(lm))
+                self.assertEqual(compiled.state, python.state)
+
 if __name__ == "__main__":
     unittest.main()
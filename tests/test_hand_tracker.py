@@ -0,0 +1,116 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+from src.hand_tracker import HandTracker, LandmarkSmoother
+from src.jit import NUMBA_AVAILABLE
+
+
+def make_tracker(infer_every):
+    """A HandTracker with only the interpolation state (no camera/model)."""
+    tracker = HandTracker.__new__(HandTracker)
+    tracker.infer_every = infer_every
+    tracker._infer_phase = 0
+    tracker._prev_lm = np.zeros((21, 3), dtype=np.float32)
+    tracker._last_lm = np.zeros((21, 3), dtype=np.float32)
+    tracker._has_prev_lm = False
+    tracker._has_last_lm = False
+    return tracker
+
+
+def test_interpolate_landmarks():
+    rng = np.random.default_rng(0)
+    out = np.empty((21, 3), dtype=np.float32)
+    for infer_every in (1, 2, 3, 5):
+        tracker = make_tracker(infer_every)
+        tracker._prev_lm[:] = rng.random((21, 3))
+        tracker._last_lm[:] = rng.random((21, 3))
+        tracker._has_prev_lm = tracker._has_last_lm = True
+        low = np.minimum(tracker._prev_lm, tracker._last_lm)
+        high = np.maximum(tracker._prev_lm, tracker._last_lm)
+        
+        # Moves monotonically from the previous towards the latest result
+        last_step = tracker._prev_lm.copy()
+        for phase in range(infer_every):
+            tracker._infer_phase = phase
+            assert tracker._interpolate_landmarks(out) is out
+            assert (out >= low - 1e-6).all() and (out <= high + 1e-6).all()
+            assert (np.abs(out - tracker._prev_lm) >= np.abs(last_step - tracker._prev_lm) - 1e-6).all()
+            last_step = out.copy()
+        
+        # ...and reaches it exactly at the end of the interval
+        np.testing.assert_array_equal(out, tracker._last_lm)
+
+def test_interpolate_landmarks_missing_results():
+    out = np.empty((21, 3), dtype=np.float32)
+    tracker = make_tracker(3)
+    tracker._last_lm[:] = 0.5
+    
+    # No previous result: the latest one is used as-is
+    tracker._has_last_lm = True
+    np.testing.assert_array_equal(tracker._interpolate_landmarks(out), tracker._last_lm)
+    
+    # Hand lost at the last inference: no landmarks for the whole interval
+    tracker._has_prev_lm, tracker._has_last_lm = True, False
+    for phase in range(3):
+        tracker._infer_phase = phase
+        assert tracker._interpolate_landmarks(out) is None
+
+def reference_smooth(frames, alpha, jump_threshold):
+    """Per-point selective EMA, written out like the original smoother."""
+    prev = [tuple(p) for p in frames[0].tolist()]
+    results = [prev]
+    for frame in frames[1:]:
+        smoothed = []
+        for (cx, cy, cz), (px, py, pz) in zip(frame.tolist(), prev):
+            dx, dy, dz = cx - px, cy - py, cz - pz
+            if np.sqrt(dx*dx + dy*dy + dz*dz) > jump_threshold:
+                smoothed.append((cx, cy, cz))
+            else:
+                smoothed.append((alpha * cx + (1 - alpha) * px,
+                                 alpha * cy + (1 - alpha) * py,
+                                 alpha * cz + (1 - alpha) * pz))
+        prev = smoothed
+        results.append(prev)
+    return np.array(results)
+
+
+def random_track(rng, length):
+    """Small per-frame drift with occasional jumps well past the threshold."""
+    steps = rng.normal(0, 0.01, (length, 21, 3))
+    jumps = rng.random((length, 21)) < 0.1
+    steps[jumps] = rng.choice((-0.3, 0.3), (jumps.sum(), 3))
+    steps[0] = rng.random((21, 3))
+    return np.cumsum(steps, axis=0).astype(np.float32)
+
+
+@pytest.mark.parametrize("use_numba", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not NUMBA_AVAILABLE, reason="Numba not installed")),
+])
+def test_smoother_matches_reference(use_numba):
+    rng = np.random.default_rng(2)
+    frames = random_track(rng, 200)
+    expected = reference_smooth(frames, 0.6, 0.1)
+    
+    smoother = LandmarkSmoother(alpha=0.6, jump_threshold=0.1, use_numba=use_numba)
+    for frame, want in zip(frames, expected):
+        curr = frame.copy()
+        out = smoother.update(curr)
+        
+        # The input is left alone; the result is the smoother's own state
+        np.testing.assert_array_equal(curr, frame)
+        assert out is smoother.prev_xyz
+        np.testing.assert_allclose(out, want, atol=1e-5)
+
+if __name__ == "__main__":
+    test_interpolate_landmarks()
+    test_interpolate_landmarks_missing_results()
+    test_smoother_matches_reference(False)
+    if NUMBA_AVAILABLE:
+        test_smoother_matches_reference(True)